@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 from pathlib import Path
@@ -8,7 +10,7 @@ from viennaptm.entrypoints.viennaptm import ModifierParameters
 class TestEntrypoints(unittest.TestCase):
     def test_output_pdb(self):
         mv = ModifierParameters.model_validate({"input": Path('text.pdb'),
-                                               "modify": ['C', 'O', "CB", "OD1", "ND2"],
+                                               "modify": ["A:50=V3H", "A:55=R1A", "B:-3=S1P", "C:1=T1P"],
                                                "output": Path('text.pdb')})
         self.assertEqual(mv.input.suffix, ".pdb")
         self.assertEqual(type(mv.modify), list)
@@ -18,17 +20,63 @@ class TestEntrypoints(unittest.TestCase):
         # input file needs to be a path (type: Union[Path, str]), execution should fail otherwise
         with self.assertRaises(ValidationError):
             ModifierParameters.model_validate({"input": 2,
-                                               "modify": ['C', 'O', "CB", "OD1", "ND2"],
+                                               "modify": ["A:50=V3H", "A:55=R1A", "B:-3=S1P", "C:1=T1P"],
                                                "output": Path('text.pdb')})
 
         # modification ending needs to be a list of strings, execution should fail otherwise
         with self.assertRaises(ValidationError):
             ModifierParameters.model_validate({"input": Path('text.pdb'),
-                                               "modify": [2, 'O', "CB", "OD1", "ND2"],
+                                               "modify": [2, "A:55=R1A", "B:-3=S1P", "C:1=T1P"],
                                                "output": Path('text.pdb')})
 
+        # modifications need to conform to "chain:residue=target", execution should fail otherwise
+        for malformed in ["AB:50=V3H", "A:5x=V3H", "A:50=V3", "A50=V3H", "A:50=V3H=X"]:
+            with self.assertRaises(ValidationError):
+                ModifierParameters.model_validate({"input": Path('text.pdb'),
+                                                   "modify": malformed,
+                                                   "output": Path('text.pdb')})
+
         # output file ending needs to be on ".pdb", execution should fail otherwise
         with self.assertRaises(ValidationError):
              ModifierParameters.model_validate({"input": Path('text.pdb'),
-                                                "modify": ['C', 'O', "CB", "OD1", "ND2"],
-                                                "output": Path('text.txt')})
\ No newline at end of file
+                                                "modify": ["A:50=V3H", "A:55=R1A", "B:-3=S1P", "C:1=T1P"],
+                                                "output": Path('text.txt')})
+    def test_config_file_changes_are_picked_up(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_path = Path(tmp_dir) / "config.json"
+            config_path.write_text('{"input": "1vii", "modify": "A:50=V3H"}')
+            mv = ModifierParameters(config=config_path)
+            self.assertListEqual(mv.modify, ["A:50=V3H"])
+
+            # mutating the result must not alter the cached configuration
+            mv.modify.append("A:55=R1A")
+            self.assertListEqual(ModifierParameters(config=config_path).modify, ["A:50=V3H"])
+
+            # a changed file (newer modification time) is parsed again
+            config_path.write_text('{"input": "1vii", "modify": "A:55=R1A"}')
+            stat = config_path.stat()
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertListEqual(ModifierParameters(config=config_path).modify, ["A:55=R1A"])
+
+    def test_config_file_skipped_if_all_fields_given(self):
+        explicit = {"input": "1vii", "modify": "A:50=V3H", "output": "out.pdb", "gromacs": {},
+                    "logger": "console", "debug": False, "ptm_list": None}
+
+        # the config file is never parsed, hence even invalid content is accepted
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text("- not a mapping")
+            mv = ModifierParameters(config=config_path, **explicit)
+        self.assertListEqual(mv.modify, ["A:50=V3H"])
+        self.assertEqual(mv.output, Path("out.pdb"))
+
+        # a missing config file is still reported
+        with self.assertRaises(ValidationError):
+            ModifierParameters(config="does_not_exist.yaml", **explicit)
+
+    def test_parameters_are_frozen(self):
+        mv = ModifierParameters(input="1vii", modify="A:50=V3H")
+        with self.assertRaises(ValidationError):
+            mv.output = Path("other.pdb")
+        with self.assertRaises(ValidationError):
+            mv.gromacs.minimize = True
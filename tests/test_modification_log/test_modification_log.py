@@ -45,6 +45,54 @@ class TestModificationLog(unittest.TestCase):
         self.assertTrue(deleted_row.empty)
         self.assertFalse(not_deleted_row.empty)
 
+    def test_log_grows_beyond_initial_capacity(self):
+        for residue_number in range(1, 40):
+            self.annotated_structure.add_to_modification_log(residue_number, "B", "V3H", "mod_name")
+        self.assertEqual(len(self.annotated_structure.get_log()), 40)
+
+        self.annotated_structure.delete_log_entry(20, "B")
+        log = self.annotated_structure.get_log()
+        self.assertEqual(len(log), 39)
+        self.assertNotIn(20, log["residue_number"].tolist())
+        self.assertEqual(log["residue_number"].tolist()[:2], [60, 1])
+
+    def test_add_modifications_in_bulk(self):
+        self.annotated_structure.add_modifications([(70, "A", "V3H", "mod_name"),
+                                                    {"residue_number": 71,
+                                                     "chain_identifier": "B",
+                                                     "original_abbreviation": "V3H",
+                                                     "target_abbreviation": "mod_name"}])
+        log = self.annotated_structure.get_log()
+        self.assertListEqual(log["residue_number"].tolist(), [60, 70, 71])
+        self.assertListEqual(log["chain_identifier"].tolist(), ["A", "A", "B"])
+
+    def test_too_long_values_are_rejected(self):
+        # fixed-width fields would silently truncate the values
+        with self.assertRaises(ValueError):
+            self.annotated_structure.add_to_modification_log(61, "CHAIN", "V3H", "mod_name")
+        with self.assertRaises(ValueError):
+            self.annotated_structure.add_to_modification_log(61, "A", "V3H", "a_very_long_modification_name")
+        self.assertEqual(len(self.annotated_structure.get_log()), 1)
+
+    def test_in_place_edit_is_not_stored(self):
+        # every access builds a new frame, so edits must be assigned back
+        log = self.annotated_structure.modification_log
+        log.loc[0, "residue_number"] = 99
+        self.assertListEqual(self.annotated_structure.get_log()["residue_number"].tolist(), [60])
+
+    def test_assign_edited_log(self):
+        log = self.annotated_structure.modification_log
+        log.loc[len(log)] = [70, "B", "V3H", "mod_name"]
+        log["residue_number"] += 1
+        self.annotated_structure.modification_log = log
+
+        log = self.annotated_structure.get_log()
+        self.assertListEqual(log["residue_number"].tolist(), [61, 71])
+        self.assertListEqual(log["chain_identifier"].tolist(), ["A", "B"])
+
+        with self.assertRaises(ValueError):
+            self.annotated_structure.modification_log = log.drop(columns="chain_identifier")
+
     def test_printing(self):
         # Make StringIO
         temp_out = StringIO()
@@ -1,2 +1,3 @@
 from tests.tests_gromacs.test_pdb2gmx import *
 from tests.tests_gromacs.test_minimzation_pipeline import *
+from tests.tests_gromacs.test_gromacs_command import *
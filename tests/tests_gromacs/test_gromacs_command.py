@@ -0,0 +1,94 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from viennaptm.gromacs.gromacs_command import GromacsCommand, run_gromacs_commands
+from viennaptm.gromacs.editconf import EditConf
+from viennaptm.gromacs.mdrun import Mdrun
+
+
+class _PythonCommand(GromacsCommand):
+    # stands in for a GROMACS tool, so that the command handling can be tested without GROMACS
+    def __init__(self, script: str, **kwargs):
+        self.script = script
+        super().__init__(gmx_bin=sys.executable, **kwargs)
+
+    def build_gromacs_cmd(self):
+        return [self.gmx_bin, "-c", self.script]
+
+    def expected_outputs(self):
+        return []
+
+
+class Test_GromacsCommand(unittest.TestCase):
+
+    def test_run_retains_output_tail(self):
+        result = _PythonCommand("import sys\n"
+                                "for i in range(100): print(i)\n"
+                                "print(sys.stdin.read().strip(), file=sys.stderr)",
+                                stdin="from stdin\n").run()
+
+        self.assertEqual(result.returncode, 0)
+        lines = result.stdout.splitlines()
+        self.assertEqual(len(lines), GromacsCommand._RETAINED_LINES)
+        self.assertEqual(lines[-1], "99")
+        self.assertEqual(result.stderr.strip(), "from stdin")
+
+    def test_run_logs_stderr_as_warning(self):
+        with self.assertLogs("viennaptm.gromacs.gromacs_command", level="WARNING") as logs:
+            _PythonCommand("import sys\n"
+                           "print('Note: no GPU detected', file=sys.stderr)").run()
+        self.assertEqual(logs.records[0].getMessage(), "Note: no GPU detected")
+
+    def test_run_detects_fatal_error(self):
+        command = _PythonCommand("for i in range(100): print(i)\n"
+                                 "print('Fatal error:')\n"
+                                 "print('Atom X not found')\n"
+                                 "for i in range(100): print(i)")
+        with self.assertRaises(RuntimeError) as context:
+            command.run()
+        self.assertIn("Fatal error:\nAtom X not found", str(context.exception))
+
+    def test_run_timeout(self):
+        with self.assertRaises(RuntimeError):
+            _PythonCommand("import time; time.sleep(10)", timeout=0.5).run()
+
+    def test_missing_outputs(self):
+        command = _PythonCommand("pass")
+        command.expected_outputs = lambda: [Path("does_not_exist.gro")]
+        with self.assertRaises(FileNotFoundError):
+            command.run()
+
+    def test_present_outputs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "out.gro"
+            command = _PythonCommand(f"open({str(output)!r}, 'w').close()")
+            command.expected_outputs = lambda: [output, Path(tmpdir)]
+            self.assertEqual(command.run().returncode, 0)
+
+    def test_run_gromacs_commands_checks_outputs_at_end(self):
+        first = _PythonCommand("print('first')")
+        first.expected_outputs = lambda: [Path("does_not_exist.gro")]
+        second = _PythonCommand("print('second')")
+
+        # the second stage still runs, the missing output is only reported afterwards
+        executed = []
+        second.execute = lambda cmd: executed.append(cmd)
+        with self.assertRaises(FileNotFoundError):
+            run_gromacs_commands([first, second])
+        self.assertEqual(len(executed), 1)
+
+    def test_mdrun_hardware_options(self):
+        self.assertEqual(Mdrun(deffnm="em", gmx_bin="gmx").command,
+                         ["gmx", "mdrun", "-deffnm", "em"])
+        self.assertEqual(Mdrun(deffnm="em", nb="gpu", ntomp=4, pin="on", gmx_bin="gmx").command,
+                         ["gmx", "mdrun", "-deffnm", "em", "-nb", "gpu", "-ntomp", "4", "-pin", "on"])
+
+    def test_command_reflects_reassigned_arguments(self):
+        editconf = EditConf(input_gro=Path("conf.gro"), output_gro=Path("boxed.gro"), gmx_bin="gmx")
+        self.assertIn("conf.gro", editconf.command)
+
+        editconf.input_gro = Path("other.gro")
+        self.assertIn("other.gro", editconf.command)
+        self.assertNotIn("conf.gro", editconf.command)
@@ -1,12 +1,19 @@
 import os
+import stat
+import sys
+import tempfile
 import unittest
 import shutil
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
 from tests.file_paths import UNITTEST_PATH_1VII_PDB, UNITTEST_JUNK_FOLDER
 from viennaptm.dataclasses.annotatedstructure import AnnotatedStructure
-from viennaptm.gromacs.minimization_pipeline import execute_energy_minimization
+from viennaptm.gromacs.minimization_pipeline import execute_energy_minimization, execute_energy_minimizations, \
+    _omp_threads, _discard_temporary_workdir, _forcefield_fingerprint, _CLEANUP_EXECUTOR
 from viennaptm.utils.fixtures import ViennaPTMFixtures
+from viennaptm.utils.gromacs import gmx_uses_thread_mpi
 from viennaptm.utils.paths import attach_root_path
 
 
@@ -47,3 +54,78 @@ class Test_MinimizeAndWritePDB(unittest.TestCase):
         atoms_original = [atom for atom in self._structure.get_atoms()]
         self.assertListEqual([-0.15, -8.75, -7.26], [round(x, 2) for x in atoms_original[6].coord])
         self.assertListEqual([115.56, 107.94, 108.4], [round(x, 2) for x in atoms[6].coord])
+
+    def test_minimize_batch(self):
+        minimized_structures = execute_energy_minimizations([self._structure, self._structure], n_workers=2)
+
+        self.assertEqual(len(minimized_structures), 2)
+        for minimized_structure in minimized_structures:
+            atoms = [atom for atom in minimized_structure.get_atoms()]
+            self.assertEqual(len(atoms), 389)
+
+    def test_minimize_with_pdb2gmx_cache(self):
+        cache_dir = self._workdir / "pdb2gmx_cache"
+        for _ in range(2):
+            minimized_structure = execute_energy_minimization(self._structure,
+                                                              pdb2gmx_cache_dir=cache_dir)
+            atoms = [atom for atom in minimized_structure.get_atoms()]
+            self.assertEqual(len(atoms), 389)
+
+        self.assertEqual(len(list(cache_dir.iterdir())), 1)
+
+
+class Test_MdrunLayout(unittest.TestCase):
+
+    def _fake_gmx(self, directory: str, mpi_library: str) -> str:
+        # prints the relevant part of "gmx --version"
+        path = Path(directory) / "gmx"
+        path.write_text(f"#!{sys.executable}\n"
+                        f"print('GROMACS version:    2024.1')\n"
+                        f"print('MPI library:        {mpi_library}')\n")
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+        return str(path)
+
+    def test_thread_mpi_detection(self):
+        with tempfile.TemporaryDirectory() as thread_mpi_dir, tempfile.TemporaryDirectory() as mpi_dir:
+            self.assertTrue(gmx_uses_thread_mpi(self._fake_gmx(thread_mpi_dir, "thread_mpi")))
+            self.assertFalse(gmx_uses_thread_mpi(self._fake_gmx(mpi_dir, "MPI")))
+        self.assertFalse(gmx_uses_thread_mpi("/nonexistent/gmx"))
+
+    def test_omp_threads(self):
+        with mock.patch.dict(os.environ, {"OMP_NUM_THREADS": "3"}):
+            self.assertEqual(_omp_threads(), 3)
+            self.assertEqual(_omp_threads(n_workers=4), 3)
+        with mock.patch.dict(os.environ, {"OMP_NUM_THREADS": ""}):
+            self.assertIsNone(_omp_threads())
+            self.assertGreaterEqual(_omp_threads(n_workers=4), 1)
+
+
+class Test_WorkdirCleanup(unittest.TestCase):
+
+    def test_discard_temporary_workdir(self):
+        workdir = Path(tempfile.mkdtemp(prefix="viennaptm_"))
+        (workdir / "em.gro").write_text("")
+        _discard_temporary_workdir(workdir)
+
+        # the name is released immediately, the contents are removed by the cleanup thread
+        self.assertFalse(workdir.exists())
+        _CLEANUP_EXECUTOR.submit(lambda: None).result()
+        self.assertFalse(workdir.with_name(workdir.name + ".deleting").exists())
+
+
+class Test_PDB2GMXCache(unittest.TestCase):
+
+    def test_forcefield_fingerprint_changes_with_files(self):
+        with tempfile.TemporaryDirectory() as gmxlib:
+            forcefield_dir = Path(gmxlib) / "gromos54a7.ff"
+            forcefield_dir.mkdir()
+            (forcefield_dir / "forcefield.itp").write_text("; version 1\n")
+            pdb2gmx = SimpleNamespace(env={"GMXLIB": gmxlib}, params=SimpleNamespace(forcefield="gromos54a7"))
+
+            with mock.patch("viennaptm.gromacs.minimization_pipeline.get_gromacs_parameters_dir", return_value=None):
+                before = _forcefield_fingerprint(pdb2gmx)
+                (forcefield_dir / "forcefield.itp").write_text("; version 2, updated\n")
+                after = _forcefield_fingerprint(pdb2gmx)
+
+        self.assertEqual(len(before), 1)
+        self.assertNotEqual(before, after)
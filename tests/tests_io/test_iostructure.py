@@ -1,7 +1,14 @@
+import os
+import shutil
+import tempfile
 import unittest
+import urllib.error
+from pathlib import Path
+from unittest.mock import patch
 
 from tests.file_paths import UNITTEST_PATH_1VII_PDB, UNITTEST_PATH_1VII_CIF
 from viennaptm.utils.paths import attach_root_path
+import viennaptm.dataclasses.annotatedstructure as annotatedstructure
 from viennaptm.dataclasses.annotatedstructure import AnnotatedStructure
 
 
@@ -26,9 +33,77 @@ class Test_IOStructure(unittest.TestCase):
         self.assertEqual('A', list(structure.get_chains())[0].get_id())
         self.assertEqual(len(structure.get_list()[0].get_list()[0].get_list()), 36)
 
+    def test_loading_localPDB_lazy(self):
+        # load only two residues of the internal PDB file
+        structure = self._struc_io.from_pdb_lazy(path=self._1vii_PDB_path,
+                                                 residues_of_interest=[("A", 50), ("A", 55)])
+        self.assertTrue(isinstance(structure, AnnotatedStructure))
+        self.assertListEqual([50, 55], [residue.get_id()[1] for residue in structure.get_residues()])
+        self.assertListEqual(["VAL", "ARG"], [residue.get_resname() for residue in structure.get_residues()])
+
+        # atoms of the selected residues are loaded completely
+        full_structure = self._struc_io.from_pdb(path=self._1vii_PDB_path)
+        self.assertEqual(len(full_structure[0]["A"][50]), len(structure[0]["A"][50]))
+
+    def test_loading_localPDB_lazy_insertion_codes(self):
+        # residue 50 is followed by an inserted residue 50A and a record with a hybrid-36 residue number
+        with open(self._1vii_PDB_path) as fh:
+            residue_50 = [line for line in fh if line.startswith("ATOM") and line[22:26] == "  50"]
+        inserted = [line[:26] + "A" + line[27:] for line in residue_50]
+        hybrid_36 = [residue_50[0][:22] + "A00A" + residue_50[0][26:]]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "insertion_codes.pdb"
+            path.write_text("".join(residue_50 + inserted + hybrid_36))
+
+            structure = self._struc_io.from_pdb_lazy(path=path, residues_of_interest=[("A", 50)])
+            self.assertListEqual([(" ", 50, " ")], [residue.get_id() for residue in structure.get_residues()])
+
+            structure = self._struc_io.from_pdb_lazy(path=path, residues_of_interest=[("A", 50, "A")])
+            self.assertListEqual([(" ", 50, "A")], [residue.get_id() for residue in structure.get_residues()])
+
+    def test_loading_localCIF_fast(self):
+        # load internal CIF file with the fast parser
+        structure = self._struc_io.from_cif(path=self._1vii_CIF_path, fast=True)
+        self.assertTrue(isinstance(structure, AnnotatedStructure))
+        self.assertEqual('A', list(structure.get_chains())[0].get_id())
+        self.assertEqual(len(structure.get_list()[0].get_list()[0].get_list()), 36)
+
     def test_loading_PDBdb(self):
         # load PDB structure from database
         structure = self._struc_io.from_rcsb(identifier="1vii")
         self.assertTrue(isinstance(structure, AnnotatedStructure))
         self.assertEqual('A', list(structure.get_chains())[0].get_id())
         self.assertEqual(len(structure.get_list()[0].get_list()[0].get_list()), 36)
+
+    def test_loading_PDBdb_cached(self):
+        # a populated cache is used without any network access
+        cache_dir = Path(tempfile.mkdtemp())
+        shutil.copy(self._1vii_PDB_path, cache_dir / "1vii.pdb")
+        with patch.object(annotatedstructure.urllib.request, "urlopen") as urlopen:
+            structure = self._struc_io.from_rcsb(identifier="1VII", cache_dir=cache_dir)
+            urlopen.assert_not_called()
+        shutil.rmtree(cache_dir)
+
+        self.assertTrue(isinstance(structure, AnnotatedStructure))
+        self.assertEqual(len(structure.get_list()[0].get_list()[0].get_list()), 36)
+
+    def test_loading_PDBdb_cache_expired(self):
+        # an outdated cache entry triggers a download, but is still used if that fails
+        cache_dir = Path(tempfile.mkdtemp())
+        cached_path = cache_dir / "1vii.pdb"
+        shutil.copy(self._1vii_PDB_path, cached_path)
+        os.utime(cached_path, (0, 0))
+        with patch.dict(os.environ, {"VIENNAPTM_PDB_CACHE": str(cache_dir)}), \
+             patch.object(annotatedstructure.urllib.request, "urlopen",
+                          side_effect=urllib.error.URLError("offline")) as urlopen:
+            structure = self._struc_io.from_rcsb(identifier="1vii")
+            urlopen.assert_called_once()
+        shutil.rmtree(cache_dir)
+
+        self.assertEqual(len(structure.get_list()[0].get_list()[0].get_list()), 36)
+
+    def test_loading_PDBdb_invalid_identifier(self):
+        # malformed identifiers are rejected before any network access
+        for identifier in ["vii1", "1v-i", "1vii1", 1234]:
+            with self.assertRaises(AttributeError):
+                self._struc_io.from_rcsb(identifier=identifier)
@@ -27,6 +27,44 @@ class Test_Resources(unittest.TestCase):
 
         self.assertEqual(len(modifications["VAL", "V3H"].add_branches), 1)
         self.assertEqual(len(modifications["VAL", "V3H"].atom_mapping), 11)
+        self.assertEqual(modifications["VAL", "V3H"].deletions, ("CG1",))
+        self.assertEqual(modifications["VAL", "V3H"].renames, (("CG2", "CG1"),))
+
+    def test_atom_operations_follow_assigned_mapping(self):
+        modification = ModificationLibrary()["VAL", "V3H"].model_copy(deep=True)
+        modification.atom_mapping = (("N", "N"), ("CG1", None), ("CG2", None))
+        self.assertEqual(modification.deletions, ("CG1", "CG2"))
+        self.assertEqual(modification.renames, ())
+
+    def test_inverse_mapping_follows_assigned_mapping(self):
+        modification = ModificationLibrary()["VAL", "V3H"].model_copy(deep=True)
+        modification.atom_mapping = (("N", "N"), ("CA", "CA"), (None, "OH"))
+        self.assertDictEqual(modification.inverse_mapping, {"N": "N", "CA": "CA", "OH": None})
+
+    def test_weights_array_follows_assigned_weights(self):
+        branch = ModificationLibrary()["VAL", "V3H"].add_branches[0].model_copy(deep=True)
+        branch.weights = [2.0] * len(branch.anchor_atoms)
+        self.assertListEqual(branch.weights_array.tolist(), [2.0] * len(branch.anchor_atoms))
+
+    def test_library_lookup_after_changes(self):
+        modifications = ModificationLibrary()
+        v3h = modifications["VAL", "V3H"]
+
+        # removed entries are no longer found
+        del modifications[modifications.modifications.index(v3h)]
+        with self.assertRaises(IndexError):
+            _ = modifications["VAL", "V3H"]
+
+        # appended entries are found
+        modifications.append(v3h)
+        self.assertIs(modifications["VAL", "V3H"], v3h)
+
+        # a reassigned list is used instead of the previously indexed one
+        replacement = v3h.model_copy()
+        modifications.modifications = [replacement]
+        self.assertIs(modifications["VAL", "V3H"], replacement)
+        with self.assertRaises(IndexError):
+            _ = modifications["ARG", "RMN"]
 
     def test_library_template_loading(self):
         # load standard, internal database
@@ -1,6 +1,7 @@
 import logging
 import unittest
 import os
+import tempfile
 
 from viennaptm.dataclasses.annotatedstructure import AnnotatedStructure
 from tests.file_paths import UNITTEST_PATH_1VII_PDB, UNITTEST_JUNK_FOLDER
@@ -48,6 +49,74 @@ class Test_Modification_PDB(unittest.TestCase):
         self.assertTrue(os.path.exists(output_pdb_path))
         self.assertGreaterEqual(os.path.getsize(output_pdb_path), 38000)
 
+    def test_apply_batch(self):
+        structure = self._struc_io.from_pdb(path=self._1vii_PDB_path)
+        reference = Modifier().modify(structure=self._struc_io.from_pdb(path=self._1vii_PDB_path),
+                                      chain_identifier='A',
+                                      residue_number=55,
+                                      target_abbreviation="GSA")
+
+        # apply both modifications in one call
+        structure = Modifier().apply_batch(structure=structure,
+                                           modifications=[('A', 50, "V3H"), ('A', 55, "GSA")])
+        self.assertListEqual([atom.name for atom in list(reference.get_residues())[14].get_atoms()],
+                             [atom.name for atom in list(structure.get_residues())[14].get_atoms()])
+        self.assertListEqual(structure.get_log()["target_abbreviation"].tolist(), ["V3H", "GSA"])
+
+        # unknown residues are rejected
+        with self.assertRaises(ValueError):
+            Modifier().apply_batch(structure=structure, modifications=[('B', 50, "V3H")])
+
+    def test_modify_copy(self):
+        structure = self._struc_io.from_pdb(path=self._1vii_PDB_path)
+        modified = Modifier().modify(structure=structure,
+                                     chain_identifier='A',
+                                     residue_number=50,
+                                     target_abbreviation="V3H",
+                                     inplace=False)
+
+        # the original structure (including its log) is left untouched
+        self.assertEqual(list(structure.get_residues())[9].get_resname(), "VAL")
+        self.assertEqual(list(modified.get_residues())[9].get_resname(), "V3H")
+        self.assertEqual(len(structure.get_log()), 0)
+        self.assertEqual(len(modified.get_log()), 1)
+
+    def test_modify_copy_alternate_locations(self):
+        # split the CB atom of residue 50 into two alternate locations
+        with tempfile.TemporaryDirectory() as tmpdir:
+            altloc_pdb_path = os.path.join(tmpdir, "modify_copy_altloc.pdb")
+            with open(self._1vii_PDB_path) as fh, open(altloc_pdb_path, "w") as out:
+                for line in fh:
+                    if line.startswith("ATOM") and line[12:16] == " CB " and line[22:26] == "  50":
+                        out.write(line[:16] + "A" + line[17:54] + "  0.60" + line[60:])
+                        line = line[:16] + "B" + line[17:54] + "  0.40" + line[60:]
+                    out.write(line)
+            structure = self._struc_io.from_pdb(path=altloc_pdb_path)
+        modified = Modifier().modify(structure=structure,
+                                     chain_identifier='A',
+                                     residue_number=50,
+                                     target_abbreviation="V3H",
+                                     inplace=False)
+
+        # the disordered atom of the copy must select its own child, not the one of the original
+        original_cb = structure[0]['A'][50]['CB']
+        modified_cb = modified[0]['A'][50]['CB']
+        self.assertTrue(original_cb.is_disordered())
+        self.assertIsNot(modified_cb.selected_child, original_cb.selected_child)
+        coordinates = original_cb.get_coord().copy()
+        modified_cb.set_coord(coordinates + 1.0)
+        self.assertListEqual(coordinates.tolist(), original_cb.get_coord().tolist())
+        self.assertEqual(structure[0]['A'][50].get_resname(), "VAL")
+
+    def test_template_residues_are_independent(self):
+        library = Modifier().get_library()
+        template_1 = library.load_residue_from_pdb("V3H")
+        template_1.detach_child(next(template_1.get_atoms()).get_id())
+        template_2 = library.load_residue_from_pdb("V3H")
+
+        # changes to a returned template must not leak into later loads
+        self.assertIsNot(template_1, template_2)
+        self.assertEqual(len(template_1) + 1, len(template_2))
 
     def test_deletion_hydrogen_atoms(self):
         # load internal PDB file
@@ -1,15 +1,22 @@
+import gzip
+import io
 import logging
 import os
-import shutil
+import re
 import tempfile
+import time
+import urllib.request
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from Bio.PDB import PDBIO, PDBParser, PDBList, MMCIFIO
+from Bio.PDB import PDBIO, PDBParser, MMCIFIO
+from Bio.PDB.Entity import DisorderedEntityWrapper
 from Bio.PDB.Structure import Structure
-from Bio.PDB.MMCIFParser import MMCIFParser
+from Bio.PDB.StructureBuilder import StructureBuilder
+from Bio.PDB.MMCIFParser import MMCIFParser, FastMMCIFParser
 
 from viennaptm.utils.error_handling import raise_with_logging_error
 from viennaptm.utils.files import log_writeout
@@ -18,6 +25,93 @@ from viennaptm.utils.files import log_writeout
 logger = logging.getLogger(__name__)
 
 
+class _AnnotatedStructureBuilder(StructureBuilder):
+    """
+    Structure builder that makes the Biopython parsers return :class:`AnnotatedStructure` objects.
+    """
+
+    def init_structure(self, structure_id: str):
+        self.structure = AnnotatedStructure(structure_id)
+
+
+# parsers and writers are reused across calls; note that both keep state of the last call
+# (builder state and the structure set via "set_structure()"), so they are not thread-safe
+_PDB_PARSER = PDBParser(QUIET=True, structure_builder=_AnnotatedStructureBuilder())
+_CIF_PARSER = MMCIFParser(QUIET=True, structure_builder=_AnnotatedStructureBuilder())
+_FAST_CIF_PARSER = FastMMCIFParser(QUIET=True, structure_builder=_AnnotatedStructureBuilder())
+_PDB_IO = PDBIO()
+_CIF_IO = MMCIFIO()
+_WRITE_BUFFER_SIZE = 1 << 20
+
+_RCSB_DOWNLOAD_URL = "https://files.rcsb.org/download/{identifier}.pdb.gz"
+_PDB_IDENTIFIER_PATTERN = re.compile(r"[0-9][A-Za-z0-9]{3}")
+_PDB_CACHE_ENV_VARIABLE = "VIENNAPTM_PDB_CACHE"
+_PDB_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
+# record layout of the modification log (fixed-width fields, stored contiguously)
+_LOG_DTYPE = np.dtype([("residue_number", "i8"),
+                       ("chain_identifier", "U4"),
+                       ("original_abbreviation", "U16"),
+                       ("target_abbreviation", "U16")])
+_LOG_STRING_WIDTHS = {name: _LOG_DTYPE[name].itemsize // np.dtype("U1").itemsize
+                      for name in _LOG_DTYPE.names if _LOG_DTYPE[name].kind == "U"}
+_LOG_INITIAL_CAPACITY = 8
+_LOG_CATEGORICAL_COLUMNS = {"chain_identifier": "category",
+                            "original_abbreviation": "category",
+                            "target_abbreviation": "category"}
+
+
+def _write_to_cache(path: Path, content: bytes) -> None:
+    """
+    Atomically write a downloaded file to the local cache.
+
+    The content is written to a temporary file in the cache directory first and then moved
+    into place, so that concurrent readers never see partially written files. Failures
+    (e.g. a read-only home directory) are logged but do not abort the calling function.
+
+    :param path:
+        Destination path within the cache directory.
+    :type path: pathlib.Path
+    :param content:
+        File content to store.
+    :type content: bytes
+    """
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+            tmp.write(content)
+        os.replace(tmp.name, path)
+        logger.debug(f"Cached file: {path}")
+    except OSError as e:
+        logger.warning(f"Could not write cache file {path}: {e}")
+
+
+def _reselect_disordered_children(original, copied) -> None:
+    """
+    Point the disordered entities of a copy to their own selected children.
+
+    :meth:`Bio.PDB.Entity.DisorderedEntityWrapper.copy` copies the children, but keeps
+    ``selected_child`` referring to the child of the original entity; the copy would
+    otherwise read and modify atoms (or residues) of the original structure.
+
+    :param original: Entity that has been copied.
+    :param copied: Copy of ``original`` (with children in the same order).
+    """
+
+    if isinstance(original, DisorderedEntityWrapper):
+        for child_id, original_child in original.child_dict.items():
+            copied_child = copied.child_dict[child_id]
+            if original_child is original.selected_child:
+                copied.selected_child = copied_child
+            _reselect_disordered_children(original_child, copied_child)
+        return
+
+    # atoms have no children
+    for original_child, copied_child in zip(getattr(original, "child_list", ()), getattr(copied, "child_list", ())):
+        _reselect_disordered_children(original_child, copied_child)
+
+
 class AnnotatedStructure(Structure):
     """
     Extension of :class:`Bio.PDB.Structure.Structure` with annotation support.
@@ -27,9 +121,13 @@ class AnnotatedStructure(Structure):
     PDB database or from a local PDB file, annotated with modifications, and written
     back to disk.
 
-    The application log is internally stored as a :class:`pandas.DataFrame`.
+    The application log is internally stored as a typed NumPy structured array and exposed
+    as a :class:`pandas.DataFrame` (see :attr:`modification_log`).
     """
 
+    # Biopython's Structure still carries a "__dict__"; the slots only cover the log attributes
+    __slots__ = ("_log", "_log_length")
+
     def __init__(self, id):
         """
         Initialize an :class:`AnnotatedStructure` instance.
@@ -47,13 +145,67 @@ class AnnotatedStructure(Structure):
         Initialize internal attributes.
 
         This method sets up the application log used to track residue
-        modifications. It is called during normal initialization and must also
-        be called manually when an existing :class:`Biopython structure` is cast to
-        :class:`AnnotatedStructure`.
+        modifications. It is called during normal initialization, which includes
+        structures built by the module's parsers.
+        """
+
+        # the log array is over-allocated and grown by doubling; only the first "_log_length" rows are valid
+        self._log = np.empty(_LOG_INITIAL_CAPACITY, dtype=_LOG_DTYPE)
+        self._log_length = 0
+
+    @property
+    def modification_log(self) -> pd.DataFrame:
+        """
+        The application log as a :class:`pandas.DataFrame`.
+
+        .. versionchanged:: unreleased
+            Formerly a plain DataFrame attribute. A new frame is now built on every access,
+            with the string columns as categoricals. In-place edits of the returned frame
+            (e.g. ``structure.modification_log.loc[...] = ...``) are therefore lost; assign
+            the edited frame back to :attr:`modification_log` to replace the log. Chain
+            identifiers are limited to 4 and abbreviations to 16 characters.
+
+        :return: DataFrame containing all logged residue modifications.
+        :rtype: :class:`pandas.DataFrame`
         """
 
-        self.modification_log = pd.DataFrame(columns=["residue_number", "chain_identifier",
-                                                      "original_abbreviation", "target_abbreviation"])
+        # low-cardinality string columns are exposed as categoricals (stored once, compared as integer codes)
+        return pd.DataFrame(self._log[:self._log_length]).astype(_LOG_CATEGORICAL_COLUMNS)
+
+    @modification_log.setter
+    def modification_log(self, log: pd.DataFrame):
+        """
+        Replace the application log.
+
+        :param log: DataFrame with the columns ``residue_number``, ``chain_identifier``,
+                    ``original_abbreviation`` and ``target_abbreviation``.
+        :type log: :class:`pandas.DataFrame`
+
+        :raises ValueError: If columns are missing or a value exceeds its field width.
+        """
+
+        missing = [column for column in _LOG_DTYPE.names if column not in log.columns]
+        if missing:
+            raise_with_logging_error(f"Modification log is missing the columns {missing}.", logger, ValueError)
+
+        rows = self._to_log_rows(log[list(_LOG_DTYPE.names)].itertuples(index=False, name=None))
+        self._log = np.empty(max(len(rows), _LOG_INITIAL_CAPACITY), dtype=_LOG_DTYPE)
+        self._log[:len(rows)] = rows
+        self._log_length = len(rows)
+
+    def copy(self) -> "AnnotatedStructure":
+        """
+        Copy the structure (see :meth:`Bio.PDB.Entity.Entity.copy`), including its application log.
+
+        :return: Copy of the annotated structure.
+        :rtype: :class:`AnnotatedStructure`
+        """
+
+        shallow = super().copy()
+        # the log array is appended in place, so it must not be shared between copies
+        shallow._log = self._log.copy()
+        _reselect_disordered_children(self, shallow)
+        return shallow
 
     def add_to_modification_log(self, residue_number: int,
                                 chain_identifier: str,
@@ -83,10 +235,63 @@ class AnnotatedStructure(Structure):
         :param target_abbreviation:
             Three-letter abbreviation of the modified or target amino acid.
         :type target_abbreviation: str
+
+        :raises ValueError: If the chain identifier exceeds 4 or an abbreviation exceeds 16 characters.
+        """
+
+        self.add_modifications([(residue_number, chain_identifier, original_abbreviation, target_abbreviation)])
+
+    def add_modifications(self, rows: Iterable[Union[Tuple[int, str, str, str], Dict[str, Any]]]):
         """
+        Add multiple residue application entries to the application log at once.
 
-        self.modification_log.loc[len(self.modification_log)] = [residue_number, chain_identifier,
-                                                                 original_abbreviation, target_abbreviation]
+        :param rows:
+            Log entries, either as ``(residue_number, chain_identifier, original_abbreviation,
+            target_abbreviation)`` tuples or as dictionaries with these keys
+            (see :meth:`add_to_modification_log`).
+        :type rows: iterable of tuple or dict
+
+        :raises ValueError: If a value exceeds its field width (see :meth:`add_to_modification_log`).
+        """
+
+        new_rows = self._to_log_rows(rows)
+        required = self._log_length + len(new_rows)
+
+        # grow with amortized doubling, so that appending does not copy the whole log every time
+        if required > len(self._log):
+            capacity = max(len(self._log), _LOG_INITIAL_CAPACITY)
+            while capacity < required:
+                capacity *= 2
+            grown = np.empty(capacity, dtype=_LOG_DTYPE)
+            grown[:self._log_length] = self._log[:self._log_length]
+            self._log = grown
+
+        self._log[self._log_length:required] = new_rows
+        self._log_length = required
+
+    @staticmethod
+    def _to_log_rows(rows: Iterable[Union[Tuple[int, str, str, str], Dict[str, Any]]]) -> np.ndarray:
+        """
+        Convert log entries into a structured array of the log record layout.
+
+        :param rows: Log entries as tuples or dictionaries (see :meth:`add_modifications`).
+        :type rows: iterable of tuple or dict
+
+        :return: The entries as structured array.
+        :rtype: numpy.ndarray
+
+        :raises ValueError: If a string value exceeds its field width, as NumPy would silently truncate it.
+        """
+
+        rows = [tuple(row[field] for field in _LOG_DTYPE.names) if isinstance(row, dict) else tuple(row)
+                for row in rows]
+        for row in rows:
+            for field, value in zip(_LOG_DTYPE.names, row):
+                width = _LOG_STRING_WIDTHS.get(field)
+                if width is not None and len(str(value)) > width:
+                    raise_with_logging_error(f"Modification log field '{field}' is limited to {width} characters, "
+                                             f"got '{value}'.", logger, ValueError)
+        return np.array(rows, dtype=_LOG_DTYPE)
 
     def get_log(self) -> pd.DataFrame:
         """
@@ -102,22 +307,15 @@ class AnnotatedStructure(Structure):
         """
         Print the application log to stdout.
 
-        The index is removed prior to printing, and pandas display options
-        are adjusted to allow printing of wide and long tables (max. columns 1000
-        and max. width 1000).
+        The log is printed without its index. Pandas display options allowing
+        wide and long tables (max. columns 1000 and max. width 1000) are only
+        applied while printing and do not leak into the global pandas settings.
         """
 
-        # settings allow printing of long and wide dataframes
-        pd.set_option('display.width', 1000)
-        pd.set_option('display.max_columns', 1000)
-
-        # removes index
-        blankIndex = [''] * len(self.modification_log)
-        self.modification_log.index = blankIndex
-
-        # adds a line for better visibility
-        print('\n')
-        print(self.modification_log)
+        with pd.option_context('display.width', 1000, 'display.max_columns', 1000):
+            # adds a line for better visibility
+            print('\n')
+            print(self.modification_log.to_string(index=False))
 
     def delete_log_entry(self, residue_number: int, chain_identifier: str,):
         """
@@ -137,24 +335,41 @@ class AnnotatedStructure(Structure):
         :type chain_identifier: str
         """
 
-        self.modification_log.drop(self.modification_log[(self.modification_log["residue_number"] == residue_number)&
-                                                         (self.modification_log["chain_identifier"] == chain_identifier)].index,
-                                    inplace=True)
+        # vectorized comparison on the fixed-width fields, keeping all non-matching rows
+        log = self._log[:self._log_length]
+        mask = (log["residue_number"] == residue_number) & (log["chain_identifier"] == chain_identifier)
+        kept = log[~mask]
+        self._log[:len(kept)] = kept
+        self._log_length = len(kept)
 
     @classmethod
-    def from_rcsb(cls, identifier: str):
+    def from_rcsb(cls, identifier: str,
+                  cache_dir: Optional[Union[str, Path]] = None,
+                  max_age: Optional[float] = _PDB_CACHE_MAX_AGE):
         """
         Load a `AnnotatedStructure` (base: :class:`Biopython PDB structure`) from the
         `RCSB PDB database <https://www.rcsb.org/>`_ via an identifier. Default format has changed to mmcif.
 
-        The file is downloaded to a temporary directory, parsed, and then removed after loading.
+        The gzipped PDB file is streamed from RCSB, decompressed in memory and stored in a local
+        cache directory (``~/.cache/viennaptm/pdb`` or the path set by the ``VIENNAPTM_PDB_CACHE``
+        environment variable). Subsequent requests for the same identifier are served from the
+        cache without any network access, as long as the cached file is not older than ``max_age``.
+        If an outdated cache entry cannot be refreshed, it is used nevertheless (with a warning).
 
         :param identifier:
             Four-character PDB identifier.
         :type identifier: str
 
+        :param cache_dir:
+            Cache directory to use instead of the default one (resolved on every call).
+        :type cache_dir: str or pathlib.Path, optional
+
+        :param max_age:
+            Maximum age of a cache entry in seconds (default: 7 days); ``None`` never expires entries.
+        :type max_age: float, optional
+
         :raises AttributeError:
-            If the identifier is not a string of length four.
+            If the identifier is not a string of length four, starting with a digit.
         :raises FileExistsError:
             If the PDB file could not be retrieved.
 
@@ -162,28 +377,41 @@ class AnnotatedStructure(Structure):
         :rtype: :class:`AnnotatedStructure`
         """
 
-        if not isinstance(identifier, str) or len(identifier) != 4:
-            raise_with_logging_error("Parameter identifier required to be a string of length four.",
-                                    logger=logger,
-                                    exception_type=AttributeError)
-
-        # download the file; store it in a local copy (to provide identical results to "from_pdb_file()"
-        downloader = PDBList()
-        tmp_folder = tempfile.mkdtemp()
-        path = downloader.retrieve_pdb_file(pdb_code=identifier, pdir=tmp_folder, file_format="pdb")
-        logger.debug(f"Wrote temporary file: {path}")
-
-        # check whether file exists (success) or not
-        if not os.path.isfile(path):
-            raise_with_logging_error(f"Structure with identifier {identifier} (attempted path: {path}) "
+        # reject malformed identifiers locally (a digit followed by three alphanumeric characters)
+        if not isinstance(identifier, str) or not _PDB_IDENTIFIER_PATTERN.fullmatch(identifier):
+            raise_with_logging_error("Parameter identifier required to be a string of length four "
+                                     "(a digit followed by three alphanumeric characters).",
+                                     logger=logger,
+                                     exception_type=AttributeError)
+
+        # use the local cache copy, if available and recent enough
+        if not cache_dir:
+            cache_dir = os.environ.get(_PDB_CACHE_ENV_VARIABLE) or Path.home() / ".cache" / "viennaptm" / "pdb"
+        cached_path = Path(cache_dir) / f"{identifier.lower()}.pdb"
+        cache_exists = cached_path.is_file()
+        if cache_exists and (max_age is None or time.time() - cached_path.stat().st_mtime <= max_age):
+            logger.debug(f"Loading structure {identifier} from cache: {cached_path}")
+            return _PDB_PARSER.get_structure(identifier, str(cached_path))
+
+        # stream the gzipped PDB file and decompress it in memory
+        url = _RCSB_DOWNLOAD_URL.format(identifier=identifier.lower())
+        logger.debug(f"Downloading structure from: {url}")
+        try:
+            with urllib.request.urlopen(url) as response, gzip.GzipFile(fileobj=response) as handle:
+                content = handle.read()
+        except OSError as e:
+            # covers network errors as well ("urllib.error.URLError" derives from "OSError")
+            if cache_exists:
+                logger.warning(f"Could not refresh structure {identifier} ({e}), using outdated cache file: {cached_path}")
+                return _PDB_PARSER.get_structure(identifier, str(cached_path))
+            raise_with_logging_error(f"Structure with identifier {identifier} (attempted URL: {url}) "
                                      f"could not be retrieved.",
                                      logger=logger,
-                                     exception_type=FileExistsError)
+                                     exception_type=FileExistsError,
+                                     exp=e)
 
-        # load the file, clean it up and return structure
-        annotated_structure = cls.from_pdb(path=path)
-        shutil.rmtree(os.path.dirname(path))
-        return annotated_structure
+        _write_to_cache(path=cached_path, content=content)
+        return _PDB_PARSER.get_structure(identifier, io.StringIO(content.decode()))
 
     @classmethod
     def from_pdb(cls, path: Union[str, Path]):
@@ -208,16 +436,64 @@ class AnnotatedStructure(Structure):
                                      exception_type=TypeError)
 
         # load the file and return structure
-        parser = PDBParser()
-        structure = parser.get_structure(id=os.path.basename(path), file=path)
+        # the file name without extension serves as structure identifier
+        path = Path(path)
+        return _PDB_PARSER.get_structure(id=path.stem, file=str(path))
+
+    @classmethod
+    def from_pdb_lazy(cls, path: Union[str, Path], residues_of_interest: Iterable[Tuple[str, int]]):
+        """
+        Instantiate an `AnnotatedStructure` with only a subset of residues from a local PDB file.
+
+        The file is scanned once and only the ``ATOM`` / ``HETATM`` records of the requested
+        residues (plus ``MODEL`` / ``ENDMDL`` delimiters) are handed to the parser; all other
+        records are skipped. For large structures (e.g. viral capsids or ribosomes) where only
+        a handful of residues are to be inspected or modified, this avoids building Python
+        objects for atoms that are never touched.
+
+        :param path:
+            Path to the local PDB file.
+        :type path: str or pathlib.Path
 
-        # caution: __init__() of AnnotatedStructure is not executed! Manually add attributes!
-        structure.__class__ = AnnotatedStructure
-        structure._init_calls()
-        return structure
+        :param residues_of_interest:
+            Residues to load, given as ``(chain_identifier, residue_number)`` pairs or as
+            ``(chain_identifier, residue_number, insertion_code)`` triples; pairs only select
+            residues without insertion code.
+        :type residues_of_interest: iterable of tuple[str, int] or tuple[str, int, str]
+
+        :raises TypeError:
+            If the path is not a string or Path object.
+
+        :return: Annotated structure containing only the selected residues.
+        :rtype: :class:`AnnotatedStructure`
+        """
+
+        if not isinstance(path, (str, Path)):
+            raise_with_logging_error(f"Parameter path (attempted path: {path}) required to be a path "
+                                     f"(as string or Path object) to a local PDB file.",
+                                     logger=logger,
+                                     exception_type=TypeError)
+
+        # one pass over the file, keeping only the coordinate records of the selected residues;
+        # chain identifier (column 22), residue number (columns 23-26) and insertion code (column 27)
+        # are fixed-width fields, compared as text (so that e.g. hybrid-36 numbers never fail to parse)
+        selection = {(chain, str(int(number)), insertion_code[0].strip() if insertion_code else "")
+                     for chain, number, *insertion_code in residues_of_interest}
+        selected_lines = []
+        with open(path, "r") as fh:
+            for line in fh:
+                record = line[:6]
+                if record in ("ATOM  ", "HETATM"):
+                    if (line[21], line[22:26].strip(), line[26:27].strip()) in selection:
+                        selected_lines.append(line)
+                elif record in ("MODEL ", "ENDMDL"):
+                    selected_lines.append(line)
+        logger.debug(f"Selected {len(selected_lines)} records for {len(selection)} residues from {path}.")
+
+        return _PDB_PARSER.get_structure(id=Path(path).stem, file=io.StringIO("".join(selected_lines)))
 
     @classmethod
-    def from_cif(cls, path: Union[str, Path]):
+    def from_cif(cls, path: Union[str, Path], fast: bool = False):
         """
         Instantiate an `AnnotatedStructure` (base: :class:`Biopython PDB structure`) with data from a local file.
 
@@ -225,6 +501,11 @@ class AnnotatedStructure(Structure):
             Path to the local MMCIF file (ends on .cif).
         :type path: str or pathlib.Path
 
+        :param fast:
+            If ``True``, use :class:`Bio.PDB.MMCIFParser.FastMMCIFParser`, which skips
+            secondary structure and anisotropic B-factor records. Recommended for large files.
+        :type fast: bool
+
         :raises TypeError:
             If the path is not a string or Path object.
 
@@ -239,13 +520,9 @@ class AnnotatedStructure(Structure):
                                      exception_type=TypeError)
 
         # load the file and return structure
-        parser = MMCIFParser()
-        structure = parser.get_structure(structure_id=os.path.basename(path), filename=path)
-
-        # caution: __init__() of AnnotatedStructure is not executed! Manually add attributes!
-        structure.__class__ = AnnotatedStructure
-        structure._init_calls()
-        return structure
+        path = Path(path)
+        parser = _FAST_CIF_PARSER if fast else _CIF_PARSER
+        return parser.get_structure(structure_id=path.stem, filename=str(path))
 
     def to_pdb(self, path: Union[str, Path]) -> None:
         """
@@ -256,9 +533,13 @@ class AnnotatedStructure(Structure):
         :type path: str
         """
 
-        io = PDBIO()
-        io.set_structure(self)
-        io.save(file=str(path))
+        # render all records into memory first and write the file in one go, rather than
+        # issuing one write call per ATOM record
+        buffer = io.StringIO()
+        _PDB_IO.set_structure(self)
+        _PDB_IO.save(file=buffer)
+        with open(path, "w", buffering=_WRITE_BUFFER_SIZE, newline="\n") as fh:
+            fh.write(buffer.getvalue())
         log_writeout(logger=logger, path=path)
 
     def to_cif(self, path: Union[str, Path]) -> None:
@@ -269,7 +550,8 @@ class AnnotatedStructure(Structure):
             Destination path for the mmCIF file.
         :type path: str
         """
-        io = MMCIFIO()
-        io.set_structure(self)
-        io.save(str(path))
+        # open the file ourselves with a large buffer and without newline translation
+        with open(path, "w", buffering=_WRITE_BUFFER_SIZE, newline="\n") as fh:
+            _CIF_IO.set_structure(self)
+            _CIF_IO.save(fh)
         log_writeout(logger=logger, path=path)
@@ -1,9 +1,87 @@
-import json
+from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union, Dict, Any, Literal
+from typing import Optional, Union, Dict, Any, Literal, Tuple
 
-import yaml
-from pydantic import BaseModel, model_validator, field_validator, Field
+from pydantic import BaseModel, ConfigDict, model_validator, field_validator, Field
+
+try:
+    # orjson parses bytes directly and is considerably faster for large configs
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+
+def parse_modification(modification: str) -> Tuple[str, int, str]:
+    """
+    Parse a modification specification of the form ``"A:50=V3H"`` (``chain:residue=target``).
+
+    :param modification:
+        Modification specification.
+    :type modification: str
+
+    :returns:
+        Chain identifier, residue number and target abbreviation.
+    :rtype: tuple[str, int, str]
+
+    :raises ValueError:
+        If the specification does not conform to the expected format.
+    """
+
+    chain_identifier, separator_chain, rest = modification.partition(":")
+    residue_number, separator_target, target_abbreviation = rest.partition("=")
+    if not separator_chain or not separator_target:
+        raise ValueError(f"Modification input '{modification}' needs to be a string of format 'A:50=V3H'.")
+    if len(chain_identifier) != 1 or not chain_identifier.isascii() or not chain_identifier.isalnum():
+        raise ValueError(f"Modification input '{modification}' needs to be a string of format 'A:50=V3H' "
+                         f"with the chain identifier being a string of length 1.")
+    if not residue_number.removeprefix("-").isascii() or not residue_number.removeprefix("-").isdigit():
+        raise ValueError(f"Modification input '{modification}' needs to be a string of format 'A:50=V3H' "
+                         f"with the residue number being an integer.")
+    if len(target_abbreviation) != 3 or not target_abbreviation.isascii() or not target_abbreviation.isalnum():
+        raise ValueError(f"Modification input '{modification}' needs to be a string of format 'A:50=V3H' "
+                         f"with the target residue abbreviation being a string of length 3.")
+    return chain_identifier, int(residue_number), target_abbreviation
+
+
+@lru_cache(maxsize=32)
+def _load_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a YAML or JSON configuration file.
+
+    Results are cached; the modification time is part of the cache key, so that edited files
+    are parsed again.
+
+    :param path:
+        Absolute path to the configuration file.
+    :type path: str
+    :param mtime_ns:
+        Modification time of the file in nanoseconds (only used as cache key).
+    :type mtime_ns: int
+
+    :returns:
+        Parsed configuration; callers must not mutate it.
+    :rtype: dict
+
+    :raises ValueError:
+        If the config file has an unsupported extension or does not contain a top-level mapping.
+    """
+
+    suffix = Path(path).suffix
+    if suffix in {".yaml", ".yml"}:
+        # imported lazily, JSON-only workflows never load PyYAML; libyaml reads the raw bytes
+        import yaml
+        with open(path, "rb") as fh:
+            config_data = yaml.load(fh, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+    elif suffix == ".json":
+        config_data = _json_loads(Path(path).read_bytes())
+    else:
+        raise ValueError("Config file must be YAML (.yaml/.yml) or JSON (.json).")
+
+    if not isinstance(config_data, dict):
+        raise ValueError("Config file must contain a mapping at the top level.")
+
+    return config_data
 
 
 class GROMACSParameters(BaseModel):
@@ -15,17 +93,20 @@ class GROMACSParameters(BaseModel):
     :type minimize: bool
     :param forcefield: Select the GROMOS force field for the minimization (default: 'gromos54a8').
     :type forcefield: Literal['gromos45a3', 'gromos54a7', 'gromos54a8']
+    :param nb: Where ``mdrun`` computes the non-bonded interactions (``-nb``); if not set
+               (default), GROMACS decides.
+    :type nb: Literal['auto', 'cpu', 'gpu'], optional
 
     :raises ValueError: If unknown or extra parameters are provided
-                        (``extra = "forbid"``).
+                        (``extra = "forbid"``). Instances are immutable (``frozen=True``).
     """
 
     minimize: bool = Field(default=False, description="Energy minimize the modified structure.")
     forcefield: Literal['gromos45a3', 'gromos54a7', 'gromos54a8'] = Field(default="gromos54a8")
+    nb: Optional[Literal['auto', 'cpu', 'gpu']] = Field(default=None,
+                                                       description="Non-bonded interactions on 'cpu' or 'gpu'.")
 
-    model_config = {
-        "extra": "forbid"
-    }
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
 
 class ModifierParameters(BaseModel):
@@ -45,7 +126,7 @@ class ModifierParameters(BaseModel):
     Invalid or unknown parameters are rejected.
 
     :param config: Path to a YAML or JSON configuration file (optional).
-    :type config: pathlib.Path or str, optional
+    :type config: pathlib.Path, optional
     :param input: Input structure, either as a local PDB/mmCIF file or a 4-character PDB identifier.
     :type input: pathlib.Path or str, optional
     :param modify: One or more residue modification specifications, e.g., ``"A:50=V3H"``.
@@ -53,7 +134,7 @@ class ModifierParameters(BaseModel):
     :type modify: list[str] or str, optional
     :param output: Output structure file, must end with ``.pdb`` or ``.cif``.
                    Defaults to ``output.pdb``.
-    :type output: pathlib.Path or str
+    :type output: pathlib.Path
     :param gromacs: Nested GROMACS configuration parameters.
     :type gromacs: GROMACSParameters
     :param logger: Logging destination. Use ``"console"`` for stdout logging or
@@ -63,22 +144,21 @@ class ModifierParameters(BaseModel):
     :type debug: bool
 
     :raises ValueError: If unknown or extra parameters are provided
-                        (``extra="forbid"``).
+                        (``extra="forbid"``). Instances are immutable (``frozen=True``),
+                        assigning to a field raises as well.
     """
 
-    config: Optional[Union[Path, str]] = Field(default=None, description="Path to a YAML or JSON configuration file (optional).")
+    config: Optional[Path] = Field(default=None, description="Path to a YAML or JSON configuration file (optional).")
 
     input: Optional[Union[Path, str]] = Field(default=None, description="Input structure, either CIF or PDB.")
     modify: Optional[Union[list[str], str]] = Field(default=None, description="Modifications in the form of \"A:50=V3H\", which means \"chain:residue=target\".")
-    output: Optional[Union[Path, str]] = Field(default="output.pdb", description="Output structure, either CIF or PDB.")
+    output: Path = Field(default=Path("output.pdb"), description="Output structure, either CIF or PDB.")
     gromacs: Optional[GROMACSParameters] = Field(default_factory=GROMACSParameters, description="Gromacs parameters.")
     logger: Optional[str] = Field(default="console", description="Set logger to either console (default) or provide a file name.")
     debug: Optional[bool] = Field(default=False, description="If set to true, enable verbose debugging logging.")
     ptm_list: Optional[str] = Field(default=None, description="List all PTMs if set to either \"console\" or a file path.")
 
-    model_config = {
-        "extra": "forbid"
-    }
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     def is_console_logging(self) -> bool:
         """
@@ -140,33 +220,31 @@ class ModifierParameters(BaseModel):
         if not config_path.exists():
             raise ValueError(f"Config file does not exist: {config_path}.")
 
-        if config_path.suffix in {".yaml", ".yml"}:
-            with open(config_path, "r") as fh:
-                config_data = yaml.safe_load(fh) or {}
-        elif config_path.suffix == ".json":
-            with open(config_path, "r") as fh:
-                config_data = json.load(fh)
-        else:
-            raise ValueError("Config file must be YAML (.yaml/.yml) or JSON (.json).")
+        # all fields are given explicitly, so nothing from the config file would survive the merge
+        if all(field in values for field in cls.model_fields if field != "config"):
+            return values
 
-        if not isinstance(config_data, dict):
-            raise ValueError("Config file must contain a mapping at the top level.")
+        # parsed configurations are cached per path and modification time; the cache entry is copied,
+        # so that merging below (and any later mutation) does not alter it
+        config_data = deepcopy(_load_config_file(str(config_path.resolve()), config_path.stat().st_mtime_ns))
 
-        # CLI args override config file values (if present)
-        return {**config_data, **values}
+        # CLI args override config file values (if present); config_data is a
+        # private copy, so it can be updated in place
+        config_data.update(values)
+        return config_data
 
     @field_validator("output", mode="after")
     @classmethod
-    def validate_output(cls, out: Union[Path, str]) -> Path:
+    def validate_output(cls, out: Path) -> Path:
         """
-        Validate and normalize the output structure path.
+        Validate the output structure path.
 
-        Ensures that the output filename ends with ``.pdb`` or ``.cif`` and
-        converts string paths to :class:`pathlib.Path`.
+        Ensures that the output filename ends with ``.pdb`` or ``.cif``
+        (strings are coerced to :class:`pathlib.Path` by the field type).
 
         :param out:
-            Output path or filename.
-        :type out: pathlib.Path or str
+            Output path.
+        :type out: pathlib.Path
 
         :returns:
             Validated output path.
@@ -176,9 +254,6 @@ class ModifierParameters(BaseModel):
             If the output file extension is not supported.
         """
 
-        if isinstance(out, str):
-            out = Path(out)
-
         if out.suffix not in {".pdb", ".cif"}:
             raise ValueError(
                 'Output must be PDB / mmCIF format (ending must be ".pdb" or ".cif").'
@@ -191,10 +266,12 @@ class ModifierParameters(BaseModel):
         cls, input_modification: Union[list[str], str]
     ) -> list[str]:
         """
-        Normalize modification input to a list of strings.
+        Normalize modification input to a list of strings and validate them.
 
         Single modification specifications are automatically wrapped into a
-        list to ensure consistent downstream handling.
+        list to ensure consistent downstream handling. Every entry must be of
+        the form ``"A:50=V3H"`` (see :func:`parse_modification`), so malformed
+        input is rejected before any structure is loaded.
 
         :param input_modification:
             Modification specification(s).
@@ -203,10 +280,15 @@ class ModifierParameters(BaseModel):
         :returns:
             List of modification strings.
         :rtype: list[str]
+
+        :raises ValueError:
+            If a modification string does not conform to the expected format.
         """
 
         if isinstance(input_modification, str):
             input_modification = [input_modification]
+        for modification in input_modification:
+            parse_modification(modification)
         return input_modification
 
     @field_validator("input", mode="after")
@@ -256,10 +338,8 @@ class ModifierParameters(BaseModel):
         :rtype: str
         """
 
-        data = self.model_dump()
-
-        for key, value in data.items():
-            if isinstance(value, Path):
-                data[key] = str(value)
+        import yaml
 
-        return yaml.safe_dump(data, sort_keys=False)
+        # JSON mode serializes paths (including nested ones) to plain strings
+        data = self.model_dump(mode="json")
+        return yaml.dump(data, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), sort_keys=False)
@@ -1,15 +1,11 @@
 import logging
-import re
 import shutil
 import sys
 import os
 
 from pathlib import Path
 
-from viennaptm.dataclasses.annotatedstructure import AnnotatedStructure
-from viennaptm.dataclasses.parameters.modifier_parameters import ModifierParameters
-from viennaptm.gromacs.minimization_pipeline import execute_energy_minimization
-from viennaptm.modification.application.modifier import Modifier
+from viennaptm.dataclasses.parameters.modifier_parameters import ModifierParameters, parse_modification
 from viennaptm.utils.entrypoint_helper import collect_kwargs, expand_dotted_keys, print_help_CLI, print_list_ptms_CLI
 from viennaptm.utils.error_handling import raise_with_logging_error
 from viennaptm.utils.logger import instantiate_logging_CLI
@@ -47,6 +43,10 @@ def main():
     # immediately end the execution
     print_list_ptms_CLI(cfg.ptm_list)
 
+    # imported here, so that "--help" / "--version" and invalid input do not load Biopython and friends
+    from viennaptm.dataclasses.annotatedstructure import AnnotatedStructure
+    from viennaptm.modification.application.modifier import Modifier
+
     # set up logging
     instantiate_logging_CLI(cfg=cfg, logger=logger)
 
@@ -68,28 +68,19 @@ def main():
     modifier = Modifier()
     modlist = cfg.modify
     if modlist:
-        for mod_input in modlist:
-            modification = (re.split(":|=", mod_input))
-            if not len(modification[0]) == 1:
-                raise ValueError(f"Modification input needs to be a string of format 'A:50=V3H' "
-                                 f"with the chain identifier being a string of length 1.")
-
-            # check, whether the second string element (residue number) can be cast to an integer
-            _ = int(modification[1])
-
-            if not len(modification[2]) == 3:
-                raise ValueError(f"Modification input needs to be a string of format 'A:50=V3H' "
-                                 f"with the target residue abbreviation being a string of length 3.")
-            # apply a modification
-            structure = modifier.modify(structure = structure,
-                                        chain_identifier=modification[0],
-                                        residue_number=int(modification[1]),
-                                        target_abbreviation=modification[2])
-
-            logger.debug(f"Modification with parameters: "
-                         f"chain identifier {modification[0]}, "
-                         f"residue number {modification[1]} and"
-                         f"target abbreviation {modification[2]} has been successfully applied.")
+        # the format has already been validated by the parameter model
+        modifications = [parse_modification(mod_input) for mod_input in modlist]
+
+        # apply all modifications
+        structure = modifier.apply_batch(structure=structure, modifications=modifications)
+
+        # arguments are only formatted if a handler accepts the debug record
+        for chain_identifier, residue_number, target_abbreviation in modifications:
+            logger.debug("Modification with parameters: "
+                         "chain identifier %s, "
+                         "residue number %s and "
+                         "target abbreviation %s has been successfully applied.",
+                         chain_identifier, residue_number, target_abbreviation)
     else:
         logger.warning(f"No modification input provided - skipping.")
 
@@ -99,21 +90,19 @@ def main():
             logger.warning("GROMACS not found - skipping energy minimization.")
         else:
             logger.info(f"Begin energy minimization ...")
+            from viennaptm.gromacs.minimization_pipeline import execute_energy_minimization
 
             # user can choose GROMOS force field (45A3, 54A7 or 54A8 (default))
             structure = execute_energy_minimization(structure=structure,
                                                     forcefield=cfg.gromacs.forcefield,
-                                                    clean_up=False)
+                                                    clean_up=False,
+                                                    nb=cfg.gromacs.nb)
             logger.info(f"Completed energy minimization, using force field '{cfg.gromacs.forcefield}'.")
 
-    # write modified file
-    if str(cfg.output).endswith(".pdb"):
-        structure.to_pdb(str(cfg.output))
-    elif str(cfg.output).endswith(".cif"):
-        structure.to_cif(str(cfg.output))
-    else:
-        raise ValueError(f"Output file format not recognized, needs to be \".pdb\" or \".cif\".")
-    logger.debug(f"Wrote structure to file: {cfg.output}")
+    # write modified file (the suffix has been validated by the parameter model)
+    writer = {".pdb": structure.to_pdb, ".cif": structure.to_cif}[cfg.output.suffix]
+    writer(str(cfg.output))
+    logger.debug("Wrote structure to file: %s", cfg.output)
 
 if __name__ == "__main__":
     main()
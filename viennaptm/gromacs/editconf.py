@@ -25,6 +25,8 @@ class EditConf(GromacsCommand):
     :type kwargs: dict
     """
 
+    __slots__ = ("input_gro", "output_gro")
+
     def __init__(self, input_gro: Path, output_gro: Path, **kwargs):
         self.input_gro = input_gro
         self.output_gro = output_gro
@@ -1,9 +1,13 @@
 import logging
+import os
+import re
+import threading
+from collections import deque
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import subprocess
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Sequence
 from pathlib import Path
 
 from viennaptm.utils.gromacs import resolve_gmx_binary
@@ -33,6 +37,8 @@ class MPIConfig(BaseModel):
     np: int = Field(1, ge=1)
     launcher: str = "mpirun"
 
+    model_config = ConfigDict(frozen=True)
+
 
 class GromacsCommand(ABC):
     """
@@ -47,6 +53,22 @@ class GromacsCommand(ABC):
     :meth:`expected_outputs`.
     """
 
+    # fixed attribute set (subclasses add their own slots), no per-instance "__dict__"
+    __slots__ = ("gmx_bin", "mpi", "workdir", "stdin", "timeout", "env", "_cmd")
+
+    # markers indicating a failed GROMACS execution
+    _FATAL_MARKERS = (
+        "Fatal error",
+        "Segmentation fault",
+        "MPI_ABORT"
+    )
+    # all markers as one alternation, so that output is scanned in a single pass
+    _FATAL_PATTERN = re.compile("|".join(re.escape(marker) for marker in _FATAL_MARKERS))
+    _FATAL_PATTERN_BYTES = re.compile(_FATAL_PATTERN.pattern.encode())
+
+    # number of output lines retained for the result / error snippet
+    _RETAINED_LINES = 20
+
     def __init__(
         self,
         gmx_bin: Optional[str] = None,
@@ -86,6 +108,13 @@ class GromacsCommand(ABC):
         self.stdin = stdin
         self.timeout = timeout
         self.env = env
+        self._cmd = None
+
+    def __setattr__(self, name, value):
+        # a changed argument invalidates the cached command line
+        object.__setattr__(self, name, value)
+        if name != "_cmd":
+            object.__setattr__(self, "_cmd", None)
 
     def mpi_prefix(self) -> List[str]:
         """
@@ -133,55 +162,163 @@ class GromacsCommand(ABC):
 
         return self.mpi_prefix() + self.build_gromacs_cmd()
 
+    @property
+    def command(self) -> List[str]:
+        """
+        Full command invocation, built on first access and reused afterwards.
+
+        Repeated runs (e.g. retries) do not rebuild the command; assigning any
+        attribute discards it, so that it reflects the current arguments. The
+        returned list must not be modified.
+
+        :return:
+            Complete command-line argument list.
+        :rtype: list[str]
+        """
+
+        if self._cmd is None:
+            self._cmd = self.build_command()
+        return self._cmd
+
     def run(self) -> subprocess.CompletedProcess:
         """
         Execute the GROMACS command.
 
-        The command is executed synchronously. Standard output and
-        error streams are captured and inspected for fatal errors.
+        The command is executed synchronously. Standard output and error are streamed
+        line by line on separate pipes: every line is logged as it arrives (standard
+        output at INFO, standard error at WARNING level), but only a bounded part of each
+        stream is retained (the last lines or, if a fatal error marker occurred, the lines
+        following it). The retained lines are returned in the result and inspected for
+        fatal errors.
 
         :raises RuntimeError:
             If execution times out or a fatal GROMACS error is detected.
         :raises FileNotFoundError:
             If expected output files are missing after execution.
         :return:
-            Completed subprocess result.
+            Completed subprocess result; ``stdout`` and ``stderr`` only hold the retained
+            lines (at most :attr:`_RETAINED_LINES` each), not the complete output.
+        :rtype: subprocess.CompletedProcess
+        """
+
+        result = self.execute(self.command)
+        self.post_run_checks()
+
+        return result
+
+    def execute(self, cmd: List[str]) -> subprocess.CompletedProcess:
+        """
+        Execute a prepared command invocation without checking expected outputs.
+
+        See :meth:`run` for how output is streamed, retained and inspected.
+
+        :param cmd:
+            Complete command-line argument list, as returned by :attr:`command`.
+        :type cmd: list[str]
+        :raises RuntimeError:
+            If execution times out or a fatal GROMACS error is detected.
+        :return:
+            Completed subprocess result; ``stdout`` and ``stderr`` only hold the retained
+            lines (at most :attr:`_RETAINED_LINES` each), not the complete output.
         :rtype: subprocess.CompletedProcess
         """
 
-        cmd = self.build_command()
         logger.info("Executing: %s", " ".join(cmd))
 
+        process = subprocess.Popen(
+            cmd,
+            cwd=self.workdir,
+            stdin=subprocess.PIPE if self.stdin is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=self.env
+        )
+
+        # the timeout is enforced by killing the process, which also ends the read loops below
+        timed_out = threading.Event()
+
+        def _kill():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(self.timeout, _kill) if self.timeout is not None else None
+        if timer is not None:
+            timer.start()
+
+        # stderr is drained concurrently, so that neither pipe can fill up and block the process
+        stdout_lines = []
+        stderr_lines = []
+        stderr_reader = threading.Thread(target=self._consume_stream,
+                                         args=(process.stderr, logging.WARNING, stderr_lines),
+                                         daemon=True)
+        stderr_reader.start()
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=self.workdir,
-                input=self.stdin,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=self.timeout,
-                env=self.env
-            )
-        except subprocess.TimeoutExpired:
+            if self.stdin is not None:
+                try:
+                    process.stdin.write(self.stdin.encode())
+                    process.stdin.close()
+                except BrokenPipeError:
+                    # the process exited without consuming its input, as tolerated by "subprocess.run()"
+                    pass
+
+            self._consume_stream(process.stdout, logging.INFO, stdout_lines)
+            returncode = process.wait()
+            stderr_reader.join()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            process.stdout.close()
+            process.stderr.close()
+
+        if timed_out.is_set():
             raise RuntimeError("GROMACS command timed out")
 
-        logger.info(result.stdout)
-        if result.stderr:
-            logger.warning(result.stderr)
+        result = subprocess.CompletedProcess(cmd, returncode,
+                                             stdout=b"".join(stdout_lines).decode(errors="replace"),
+                                             stderr=b"".join(stderr_lines).decode(errors="replace"))
 
         self.inspect_result(result)
-        self.post_run_checks()
 
         return result
 
+    def _consume_stream(self, stream, level: int, retained: List[bytes]) -> None:
+        """
+        Log every line of an output stream and retain a bounded part of it.
+
+        :param stream:
+            Binary output stream of the process.
+        :param level:
+            Logging level of the emitted lines.
+        :type level: int
+        :param retained:
+            Receives the last lines or, if a fatal error marker occurred, the lines following it.
+        :type retained: list[bytes]
+        """
+
+        tail = deque(maxlen=self._RETAINED_LINES)
+        snippet = []
+
+        # lines are kept as raw bytes; decoding only happens for emitted log records and retained lines
+        log_output = logger.isEnabledFor(level)
+        for line in stream:
+            if log_output:
+                logger.log(level, line.decode(errors="replace").rstrip("\r\n"))
+            if snippet:
+                if len(snippet) < self._RETAINED_LINES:
+                    snippet.append(line)
+            elif self._FATAL_PATTERN_BYTES.search(line):
+                snippet.append(line)
+            else:
+                tail.append(line)
+        retained.extend(snippet or tail)
+
     def inspect_result(self, result: subprocess.CompletedProcess) -> None:
         """
         Inspect command output for fatal GROMACS errors.
 
-        Both stdout and stderr are scanned for known fatal error
-        markers. If detected, a readable error snippet is extracted
-        and raised as an exception.
+        Both stderr and stdout are scanned for known fatal error
+        markers (stopping at the first stream with a hit). If detected,
+        a readable error snippet is extracted and raised as an exception.
 
         :param result:
             Completed subprocess result to inspect.
@@ -190,22 +327,16 @@ class GromacsCommand(ABC):
             If a fatal GROMACS error marker is found.
         """
 
-        fatal_markers = (
-            "Fatal error",
-            "Segmentation fault",
-            "MPI_ABORT"
-        )
-
-        combined = "\n".join(
-            s for s in (result.stderr, result.stdout) if s
-        )
+        # scan each stream separately (no concatenated copy, one pass for all markers) and only split lines around a hit
+        for stream in (result.stderr, result.stdout):
+            if not stream:
+                continue
 
-        for marker in fatal_markers:
-            if marker in combined:
-                # extract a readable error snippet
-                lines = combined.splitlines()
-                start = next((i for i, line in enumerate(lines) if marker in line), 0)
-                snippet = "\n".join(lines[start:start + 20])
+            match = self._FATAL_PATTERN.search(stream)
+            if match:
+                # extract a readable error snippet, starting with the line of the first marker
+                start = stream.rfind("\n", 0, match.start()) + 1
+                snippet = "\n".join(stream[start:].split("\n", self._RETAINED_LINES)[:self._RETAINED_LINES])
 
                 raise RuntimeError(
                     "GROMACS fatal error detected:\n"
@@ -235,8 +366,47 @@ class GromacsCommand(ABC):
             If any expected output file is missing.
         """
 
+        # one directory listing per parent directory instead of one "stat" call per output
+        listings = {}
         for path in self.expected_outputs():
-            if not path.exists():
+            parent = path.parent
+            if parent not in listings:
+                try:
+                    with os.scandir(parent) as entries:
+                        listings[parent] = {entry.name for entry in entries}
+                except OSError:
+                    listings[parent] = None
+
+            names = listings[parent]
+            exists = path.name in names if names is not None else path.exists()
+            if not exists:
                 raise FileNotFoundError(
                     f"Expected output missing: {path}"
                 )
+
+
+def run_gromacs_commands(commands: Sequence[GromacsCommand]) -> List[subprocess.CompletedProcess]:
+    """
+    Execute several GROMACS commands back to back.
+
+    All command lines are built before the first command starts, so no argument
+    construction happens between stages. Fatal errors are still detected per stage,
+    while the expected outputs of all commands are only verified after the last one.
+
+    :param commands:
+        Commands in execution order.
+    :type commands: Sequence[GromacsCommand]
+    :raises RuntimeError:
+        If a stage times out or a fatal GROMACS error is detected.
+    :raises FileNotFoundError:
+        If expected output files are missing after execution.
+    :return:
+        Completed subprocess results, one per command.
+    :rtype: list[subprocess.CompletedProcess]
+    """
+
+    cmds = [command.command for command in commands]
+    results = [command.execute(cmd) for command, cmd in zip(commands, cmds)]
+    for command in commands:
+        command.post_run_checks()
+    return results
@@ -31,6 +31,8 @@ class Grompp(GromacsCommand):
     :type kwargs: dict
     """
 
+    __slots__ = ("mdp", "structure", "topology", "tpr")
+
     def __init__(
         self,
         mdp: Path,
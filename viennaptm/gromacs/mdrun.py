@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import Optional
+
 from viennaptm.gromacs.gromacs_command import GromacsCommand
 
 
@@ -13,14 +15,50 @@ class Mdrun(GromacsCommand):
     :param deffnm:
         Default filename prefix for input and output files.
     :type deffnm: str
+    :param nb:
+        Where to compute short-range non-bonded interactions (``auto``, ``cpu`` or ``gpu``).
+    :type nb: str or None
+    :param pme:
+        Where to compute PME long-range electrostatics (``auto``, ``cpu`` or ``gpu``).
+    :type pme: str or None
+    :param bonded:
+        Where to compute bonded interactions (``auto``, ``cpu`` or ``gpu``).
+    :type bonded: str or None
+    :param ntmpi:
+        Number of thread-MPI ranks.
+    :type ntmpi: int or None
+    :param ntomp:
+        Number of OpenMP threads per rank.
+    :type ntomp: int or None
+    :param pin:
+        Thread pinning (``auto``, ``on`` or ``off``).
+    :type pin: str or None
     :param kwargs:
         Additional keyword arguments forwarded to
         :class:`GromacsCommand`.
     :type kwargs: dict
     """
 
-    def __init__(self, deffnm: str, **kwargs):
+    __slots__ = ("deffnm", "nb", "pme", "bonded", "ntmpi", "ntomp", "pin")
+
+    def __init__(
+        self,
+        deffnm: str,
+        nb: Optional[str] = None,
+        pme: Optional[str] = None,
+        bonded: Optional[str] = None,
+        ntmpi: Optional[int] = None,
+        ntomp: Optional[int] = None,
+        pin: Optional[str] = None,
+        **kwargs
+    ):
         self.deffnm = deffnm
+        self.nb = nb
+        self.pme = pme
+        self.bonded = bonded
+        self.ntmpi = ntmpi
+        self.ntomp = ntomp
+        self.pin = pin
         super().__init__(**kwargs)
 
     def build_gromacs_cmd(self):
@@ -29,17 +67,26 @@ class Mdrun(GromacsCommand):
 
         The command uses the default filename prefix to locate the
         input ``.tpr`` file and generate all simulation output files.
+        Hardware options are only passed if set, otherwise GROMACS
+        chooses them itself.
 
         :return:
             Command-line argument list suitable for execution.
         :rtype: list[str]
         """
 
-        return [
+        cmd = [
             self.gmx_bin, "mdrun",
             "-deffnm", self.deffnm
         ]
 
+        for flag, value in (("-nb", self.nb), ("-pme", self.pme), ("-bonded", self.bonded),
+                            ("-ntmpi", self.ntmpi), ("-ntomp", self.ntomp), ("-pin", self.pin)):
+            if value is not None:
+                cmd += [flag, str(value)]
+
+        return cmd
+
     def expected_outputs(self):
         """
         Declare the primary output files expected from the simulation.
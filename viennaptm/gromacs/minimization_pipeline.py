@@ -1,25 +1,75 @@
+import hashlib
 import logging
+import multiprocessing
+import os
 import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Union
+from typing import List, Optional, Sequence, Union
 
 from viennaptm.dataclasses.annotatedstructure import AnnotatedStructure
 from viennaptm.gromacs.editconf import EditConf
+from viennaptm.gromacs.gromacs_command import run_gromacs_commands
 from viennaptm.gromacs.grompp import Grompp
 from viennaptm.gromacs.mdrun import Mdrun
 from viennaptm.gromacs.pdb2gmx import PDB2GMX, PDB2GMXParameters
 from viennaptm.gromacs.trjconv import Trjconv
 from viennaptm.utils.fixtures import ViennaPTMFixtures
+from viennaptm.utils.files import get_gromacs_parameters_dir
+from viennaptm.utils.gromacs import gmx_uses_thread_mpi, gmx_version, resolve_gmx_binary
 
 logger = logging.getLogger(__name__)
 
+# resolved once, the bundled parameter file does not change at runtime
+_DEFAULT_MINIM_MDP = ViennaPTMFixtures().GROMACS_MINIM_MDP_DEFAULT
+
+# memory-backed scratch space (if available) for temporary directories that are removed afterwards anyway
+_SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+# removes temporary working directories off the caller's critical path (pending removals finish before
+# interpreter exit); only used in the main process, as a forked child would inherit it without a live thread
+_CLEANUP_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="viennaptm_cleanup")
+
+
+def _available_cores() -> int:
+    # the cores this process may run on (respects CPU affinity, e.g. of batch schedulers)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _omp_threads(n_workers: int = 1) -> Optional[int]:
+    """
+    Determine the number of OpenMP threads per ``mdrun`` call.
+
+    An explicit ``OMP_NUM_THREADS`` setting takes precedence. Otherwise, if several
+    minimizations run concurrently, the available cores are split between them; for a
+    single minimization, ``None`` is returned and GROMACS chooses the thread layout.
+
+    :param n_workers: Number of concurrently running minimizations.
+    :type n_workers: int
+
+    :return: Number of OpenMP threads, or ``None`` to leave the choice to GROMACS.
+    :rtype: int or None
+    """
+
+    omp_num_threads = os.environ.get("OMP_NUM_THREADS", "").strip()
+    if omp_num_threads.isdigit() and int(omp_num_threads) > 0:
+        return int(omp_num_threads)
+    if n_workers > 1:
+        return max(1, _available_cores() // n_workers)
+    return None
+
 
 def minimize_and_write_pdb(
     conf_gro: Path,
     topology: Path,
     minim_mdp: Path,
     workdir: Path,
+    nb: Optional[str] = None,
+    ntomp: Optional[int] = None,
 ) -> Path:
     """
     Run an energy minimization workflow and write a minimized PDB file.
@@ -44,6 +94,13 @@ def minimize_and_write_pdb(
     :param workdir:
         Working directory used for all intermediate and output files.
     :type workdir: pathlib.Path
+    :param nb:
+        Where ``mdrun`` computes the non-bonded interactions (``"auto"``,
+        ``"cpu"`` or ``"gpu"``). If ``None``, GROMACS decides.
+    :type nb: str or None
+    :param ntomp:
+        Number of OpenMP threads of ``mdrun``. If ``None``, GROMACS decides.
+    :type ntomp: int or None
     :return:
         Path to the minimized PDB file.
     :rtype: pathlib.Path
@@ -54,39 +111,172 @@ def minimize_and_write_pdb(
     minimized = workdir / "em.gro"
     minimized_pdb = workdir / "em.pdb"
 
-    EditConf(
-        input_gro=conf_gro,
-        output_gro=boxed,
-        workdir=workdir
-    ).run()
-
-    Grompp(
-        mdp=minim_mdp,
-        structure=boxed,
-        topology=topology,
-        tpr=tpr,
-        workdir=workdir
-    ).run()
-
-    Mdrun(
-        deffnm="em",
-        workdir=workdir
-    ).run()
-
-    Trjconv(
-        structure=minimized,
-        tpr=tpr,
-        output_pdb=minimized_pdb,
-        workdir=workdir
-    ).run()
+    # the minimization runs as a single rank; -ntmpi is only understood by thread-MPI builds
+    ntmpi = 1 if gmx_uses_thread_mpi(resolve_gmx_binary()) else None
+
+    # all stages are prepared up front; outputs are verified once after the last stage
+    run_gromacs_commands([
+        EditConf(
+            input_gro=conf_gro,
+            output_gro=boxed,
+            workdir=workdir
+        ),
+        Grompp(
+            mdp=minim_mdp,
+            structure=boxed,
+            topology=topology,
+            tpr=tpr,
+            workdir=workdir
+        ),
+        # energy minimization only supports offloading the non-bonded interactions
+        # (PME and bonded interactions on the GPU require a dynamical integrator)
+        Mdrun(
+            deffnm="em",
+            nb=nb,
+            ntmpi=ntmpi,
+            ntomp=ntomp,
+            workdir=workdir
+        ),
+        Trjconv(
+            structure=minimized,
+            tpr=tpr,
+            output_pdb=minimized_pdb,
+            workdir=workdir
+        ),
+    ])
 
     return minimized_pdb
 
 
+def _remove_workdir(workdir: Path) -> None:
+    # may run on the cleanup thread, where an exception would go unnoticed
+    try:
+        shutil.rmtree(workdir)
+    except OSError as e:
+        logger.warning("Could not remove working directory %s: %s", workdir, e)
+
+
+def _discard_temporary_workdir(workdir: Path) -> None:
+    """
+    Remove a temporary working directory created by :func:`execute_energy_minimization`.
+
+    The directory is first renamed to a tombstone path, so that its name can be reused
+    immediately. In the main process, the removal itself is done by the cleanup thread;
+    in worker processes (which may exit before a background removal completes), it is
+    done synchronously.
+
+    :param workdir: The temporary working directory.
+    :type workdir: pathlib.Path
+    """
+
+    # the directory name is unique (mkdtemp), hence so is the tombstone
+    tombstone = workdir.with_name(workdir.name + ".deleting")
+    try:
+        workdir.rename(tombstone)
+    except OSError as e:
+        logger.warning("Could not remove working directory %s: %s", workdir, e)
+        return
+
+    if multiprocessing.parent_process() is None:
+        _CLEANUP_EXECUTOR.submit(_remove_workdir, tombstone)
+    else:
+        _remove_workdir(tombstone)
+
+
+def _forcefield_fingerprint(pdb2gmx: PDB2GMX) -> List[tuple]:
+    """
+    Describe the force field files ``pdb2gmx`` may read from outside the GROMACS installation.
+
+    The ``<forcefield>.ff`` directories in the bundled parameter directory and in ``GMXLIB``
+    are listed with the size and modification time of every file, so that edited or
+    updated force fields lead to a different fingerprint.
+
+    :param pdb2gmx: The prepared ``pdb2gmx`` command.
+    :type pdb2gmx: PDB2GMX
+
+    :return: ``(path, size, modification time)`` entries of the force field files.
+    :rtype: list[tuple]
+    """
+
+    search_dirs = []
+    if parameters_dir := get_gromacs_parameters_dir():
+        search_dirs.append(Path(parameters_dir))
+    gmxlib = (pdb2gmx.env or os.environ).get("GMXLIB")
+    if gmxlib:
+        search_dirs.extend(Path(entry) for entry in gmxlib.split(os.pathsep) if entry)
+
+    fingerprint = []
+    for search_dir in search_dirs:
+        forcefield_dir = search_dir / f"{pdb2gmx.params.forcefield}.ff"
+        if forcefield_dir.is_dir():
+            for forcefield_file in sorted(forcefield_dir.iterdir()):
+                stat = forcefield_file.stat()
+                fingerprint.append((str(forcefield_file.resolve()), stat.st_size, stat.st_mtime_ns))
+    return fingerprint
+
+
+def _run_pdb2gmx(pdb2gmx: PDB2GMX, workdir: Path, cache_dir: Optional[Path]) -> None:
+    """
+    Execute ``pdb2gmx``, reusing previously generated files if available.
+
+    Cache entries are keyed by a BLAKE2b hash of the input structure file, the
+    topology-relevant parameters, the interactive input, the GROMACS version and the
+    force field files outside the GROMACS installation (see :func:`_forcefield_fingerprint`),
+    so that upgrades do not return outdated topologies. On a hit, the cached
+    coordinate, topology and include files are copied into the working directory
+    instead of running ``pdb2gmx``; on a miss, the generated files are stored.
+
+    :param pdb2gmx: The prepared ``pdb2gmx`` command.
+    :type pdb2gmx: PDB2GMX
+
+    :param workdir: Directory in which the command is executed.
+    :type workdir: pathlib.Path
+
+    :param cache_dir: Cache directory, or ``None`` to always run ``pdb2gmx``.
+    :type cache_dir: pathlib.Path or None
+    """
+
+    if cache_dir is None:
+        pdb2gmx.run()
+        return
+
+    params = pdb2gmx.params
+    key = hashlib.blake2b(params.input.read_bytes(), digest_size=16)
+    key.update(repr((params.forcefield, params.water, params.chainsep, params.merge,
+                     params.ignore_h, pdb2gmx.stdin)).encode())
+    key.update(gmx_version(pdb2gmx.gmx_bin).encode())
+    key.update(repr(_forcefield_fingerprint(pdb2gmx)).encode())
+    cache_entry = cache_dir / key.hexdigest()
+
+    if cache_entry.is_dir():
+        logger.debug("Reusing cached pdb2gmx output: %s", cache_entry)
+        for cached_file in cache_entry.iterdir():
+            shutil.copy2(cached_file, workdir / cached_file.name)
+        return
+
+    existing_includes = set(workdir.glob("*.itp"))
+    pdb2gmx.run()
+
+    # populate a private directory first and rename it, so concurrent runs never see a partial entry
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".staging_", dir=cache_dir))
+    generated = [params.output_gro, params.topology, *(set(workdir.glob("*.itp")) - existing_includes)]
+    for generated_file in generated:
+        shutil.copy2(generated_file, staging / generated_file.name)
+    try:
+        staging.rename(cache_entry)
+    except OSError:
+        # another process stored the same entry in the meantime
+        shutil.rmtree(staging, ignore_errors=True)
+
+
 def execute_energy_minimization(structure: AnnotatedStructure,
                                 forcefield: str = "gromos54a7",
                                 workdir: Union[Path, str] = None,
-                                clean_up: bool = True) -> AnnotatedStructure:
+                                clean_up: bool = True,
+                                pdb2gmx_cache_dir: Optional[Union[Path, str]] = None,
+                                nb: Optional[str] = None,
+                                ntomp: Optional[int] = None) -> AnnotatedStructure:
     """
     Perform GROMACS-based energy minimization on a structure.
 
@@ -95,7 +285,8 @@ def execute_energy_minimization(structure: AnnotatedStructure,
     (``pdb2gmx`` followed by energy minimization), and reloaded as a new
     :class:`AnnotatedStructure` instance.
 
-    If no working directory is provided, a temporary directory is created.
+    If no working directory is provided, a temporary directory is created
+    (in memory-backed ``/dev/shm`` if available and ``clean_up`` is set).
     Optionally, the working directory is removed after completion.
 
     :param structure: The input structure to be energy minimized.
@@ -106,20 +297,36 @@ def execute_energy_minimization(structure: AnnotatedStructure,
     :type workdir: str or pathlib.Path or None
 
     :param clean_up: Whether to remove the working directory after
-                     successful minimization.
+                     successful minimization. A temporary directory is removed
+                     in the background, a provided one immediately.
     :type clean_up: bool
 
+    :param pdb2gmx_cache_dir: Optional directory in which ``pdb2gmx`` results are
+                              cached, so that repeated minimizations of identical
+                              structures skip topology generation.
+    :type pdb2gmx_cache_dir: str or pathlib.Path or None
+
+    :param nb: Where ``mdrun`` computes the non-bonded interactions (``"auto"``,
+               ``"cpu"`` or ``"gpu"``). If ``None``, GROMACS decides.
+    :type nb: str or None
+
+    :param ntomp: Number of OpenMP threads of ``mdrun``. If ``None``,
+                  ``OMP_NUM_THREADS`` is used if set, otherwise GROMACS decides.
+    :type ntomp: int or None
+
     :return: The minimized structure reloaded from the resulting PDB file.
     :rtype: AnnotatedStructure
 
-    :raises OSError: If working directory creation or deletion fails.
+    :raises OSError: If working directory creation, or deletion of a provided
+                     working directory fails.
     :raises RuntimeError: If any GROMACS step in the minimization
                           pipeline fails.
     """
 
     # prepare temporary folder and input
-    if not workdir:
-        workdir = Path(tempfile.mkdtemp(suffix=None, prefix="viennaptm_", dir=None))
+    temporary_workdir = not workdir
+    if temporary_workdir:
+        workdir = Path(tempfile.mkdtemp(suffix=None, prefix="viennaptm_", dir=_SCRATCH_DIR if clean_up else None))
     else:
         workdir = Path(workdir)
         workdir.mkdir(parents=True, exist_ok=True)
@@ -130,13 +337,13 @@ def execute_energy_minimization(structure: AnnotatedStructure,
     # prepare GROMACS paths
     conf_gro = workdir / "conf.gro"
     topol = workdir / "topol.top"
-    minim_mdp = ViennaPTMFixtures().GROMACS_MINIM_MDP_DEFAULT
+    minim_mdp = _DEFAULT_MINIM_MDP
 
     # create sym links to FF parameters
     #get_gmx_ff(forcefield, destination_dir=workdir)
 
-    # execute PDB2GMX
-    PDB2GMX(
+    # execute PDB2GMX (or reuse its cached output)
+    pdb2gmx = PDB2GMX(
         params=PDB2GMXParameters(
             input=input_path,
             output_gro=conf_gro,
@@ -147,18 +354,67 @@ def execute_energy_minimization(structure: AnnotatedStructure,
         ),
         workdir=workdir,
         stdin="1\n",
-    ).run()
+    )
+    _run_pdb2gmx(pdb2gmx, workdir, Path(pdb2gmx_cache_dir) if pdb2gmx_cache_dir else None)
 
     # execute remaining energy minimization pipeline
     minimized_path = minimize_and_write_pdb(
         conf_gro=conf_gro,
         topology=topol,
         minim_mdp=minim_mdp,
-        workdir=workdir
+        workdir=workdir,
+        nb=nb,
+        ntomp=ntomp if ntomp is not None else _omp_threads()
     )
 
     # reload, clean up (if set to True) and return minimized structure
     minimized_structure = AnnotatedStructure.from_pdb(minimized_path)
     if clean_up:
-        shutil.rmtree(workdir)
+        if temporary_workdir:
+            _discard_temporary_workdir(workdir)
+        else:
+            # the caller may reuse the directory right away, so it is removed before returning
+            shutil.rmtree(workdir)
     return minimized_structure
+
+
+def execute_energy_minimizations(structures: Sequence[AnnotatedStructure],
+                                 forcefield: str = "gromos54a7",
+                                 n_workers: Optional[int] = None,
+                                 nb: Optional[str] = None) -> List[AnnotatedStructure]:
+    """
+    Perform GROMACS-based energy minimization on several structures in parallel.
+
+    Every structure is minimized independently by :func:`execute_energy_minimization`
+    in a separate worker process and its own temporary working directory, which is
+    removed afterwards. Unless ``OMP_NUM_THREADS`` is set, the available cores are
+    split evenly between the workers.
+
+    :param structures: The input structures to be energy minimized.
+    :type structures: Sequence[AnnotatedStructure]
+
+    :param forcefield: Force field used for all structures.
+    :type forcefield: str
+
+    :param n_workers: Maximum number of worker processes. If ``None``, the
+                      number of processors is used.
+    :type n_workers: int or None
+
+    :param nb: Where ``mdrun`` computes the non-bonded interactions (``"auto"``,
+               ``"cpu"`` or ``"gpu"``). If ``None``, GROMACS decides.
+    :type nb: str or None
+
+    :return: The minimized structures, in the order of the input structures.
+    :rtype: list[AnnotatedStructure]
+
+    :raises RuntimeError: If any GROMACS step in one of the minimization
+                          pipelines fails.
+    """
+
+    if not structures:
+        return []
+
+    n_workers = min(n_workers or _available_cores(), len(structures))
+    minimize = partial(execute_energy_minimization, forcefield=forcefield, nb=nb, ntomp=_omp_threads(n_workers))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(minimize, structures))
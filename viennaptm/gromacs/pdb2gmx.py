@@ -2,7 +2,7 @@ import logging
 import os
 import subprocess
 
-from pydantic import Field, field_validator, BaseModel
+from pydantic import Field, BaseModel
 from typing import List, Optional
 from pathlib import Path
 
@@ -21,7 +21,7 @@ class PDB2GMXParameters(BaseModel):
     chain handling, and verbosity.
 
     All path-like parameters are normalized to :class:`pathlib.Path`
-    instances after validation.
+    instances by their field types during validation.
 
     :param input:
         Input PDB structure file.
@@ -78,19 +78,6 @@ class PDB2GMXParameters(BaseModel):
     ignore_h: bool = False
     verbose: bool = False
 
-    @field_validator(
-        "input",
-        "output_gro",
-        "topology",
-        "posre_itp",
-        "index_file",
-        "clean_pdb",
-        mode="after"
-    )
-    @classmethod
-    def ensure_paths(cls, v):
-        return Path(v) if v is not None else v
-
 
 class PDB2GMX(GromacsCommand):
     """
@@ -123,6 +110,23 @@ class PDB2GMX(GromacsCommand):
     :type env: dict[str, str] or None
     """
 
+    __slots__ = ("params",)
+
+    # optional flags and the parameter fields they are taken from (in command-line order)
+    _VALUE_OPTIONS = (
+        ("-i", "posre_itp"),
+        ("-n", "index_file"),
+        ("-q", "clean_pdb"),
+        ("-ff", "forcefield"),
+        ("-water", "water"),
+        ("-chainsep", "chainsep"),
+        ("-merge", "merge"),
+    )
+    _SWITCH_OPTIONS = (
+        ("-ignh", "ignore_h"),
+        ("-v", "verbose"),
+    )
+
     def __init__(
         self,
         params: PDB2GMXParameters,
@@ -190,27 +194,8 @@ class PDB2GMX(GromacsCommand):
             "-p", str(p.topology),
         ]
 
-        if p.posre_itp:
-            cmd += ["-i", str(p.posre_itp)]
-        if p.index_file:
-            cmd += ["-n", str(p.index_file)]
-        if p.clean_pdb:
-            cmd += ["-q", str(p.clean_pdb)]
-
-        if p.forcefield:
-            cmd += ["-ff", p.forcefield]
-        if p.water:
-            cmd += ["-water", p.water]
-
-        if p.chainsep:
-            cmd += ["-chainsep", p.chainsep]
-        if p.merge:
-            cmd += ["-merge", p.merge]
-
-        if p.ignore_h:
-            cmd.append("-ignh")
-        if p.verbose:
-            cmd.append("-v")
+        cmd += [arg for flag, field in self._VALUE_OPTIONS if (value := getattr(p, field)) for arg in (flag, str(value))]
+        cmd += [flag for flag, field in self._SWITCH_OPTIONS if getattr(p, field)]
 
         return cmd
 
@@ -25,6 +25,8 @@ class Trjconv(GromacsCommand):
     :type kwargs: dict
     """
 
+    __slots__ = ("structure", "tpr", "output_pdb")
+
     def __init__(
         self,
         structure: Path,
@@ -1,8 +1,7 @@
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 import logging
-from copy import deepcopy
 
 from Bio.PDB.Residue import Residue
 from Bio.PDB.Atom import Atom
@@ -85,7 +84,7 @@ class Modifier(BaseModel):
 
         :param inplace:
             If ``True``, the structure is modified in place.
-            If ``False``, a deep copy of the structure is created and modified.
+            If ``False``, a copy of the structure is created and modified.
         :type inplace: bool
 
         :returns:
@@ -109,28 +108,146 @@ class Modifier(BaseModel):
               ``add_to_modification_log``.
         """
 
-        # if inplace is set to False, make a copy for the manipulation
+        # if inplace is set to False, make a copy for the manipulation (Entity.copy() copies the
+        # structure tree without deepcopy's memo bookkeeping and also copies the modification log)
         if not inplace:
-            structure = deepcopy(structure)
+            structure = structure.copy()
 
         # get residue from structure
         # note: this assumes that chain IDs are unique over all models
-        residue = None
-        for cur_residue in structure.get_residues():
-            # get the full residue identifier, e.g. ("1vii.pdb", 0, 'A', (' ', 41, ' '))
-            # this means (target identifier, model number, chain identifier, (hetero- or non-hetero residue, residue
-            # number, insertion code))
-            full_id = cur_residue.get_full_id()
+        # standard residues are found by dictionary lookups, all others by scanning the structure
+        residue = self._find_standard_residue(structure, chain_identifier, residue_number)
+        if residue is None:
+            for cur_residue in structure.get_residues():
+                # get the full residue identifier, e.g. ("1vii", 0, 'A', (' ', 41, ' '))
+                # this means (target identifier, model number, chain identifier, (hetero- or non-hetero residue, residue
+                # number, insertion code))
+                full_id = cur_residue.get_full_id()
 
-            if full_id[2] == chain_identifier and full_id[3][1] == residue_number:
-                residue = cur_residue
-                break
+                if full_id[2] == chain_identifier and full_id[3][1] == residue_number:
+                    residue = cur_residue
+                    break
 
         if residue is None:
             raise_with_logging_error(f"Could not find specified residue in specified chain: {chain_identifier}:{residue_number}.",
                                      logger=logger,
                                      exception_type=ValueError)
 
+        original_residue_abbreviation = self._apply_to_residue(residue=residue,
+                                                               target_abbreviation=target_abbreviation)
+
+        # attach information on applied application
+        structure.add_to_modification_log(residue_number=residue_number,
+                                          chain_identifier=chain_identifier,
+                                          original_abbreviation=original_residue_abbreviation,
+                                          target_abbreviation=target_abbreviation)
+        return structure
+
+    @staticmethod
+    def _find_standard_residue(structure: AnnotatedStructure,
+                               chain_identifier: str,
+                               residue_number: int) -> Optional[Residue]:
+        """
+        Look up a standard (non-hetero, no insertion code) residue via the chain and residue dictionaries.
+
+        Only the first model containing the chain is considered, as in the full residue scan.
+
+        :returns:
+            The residue, or ``None`` if it has to be searched by a full scan (e.g. hetero residues).
+        :rtype: Bio.PDB.Residue.Residue or None
+        """
+
+        for model in structure:
+            chain = model.child_dict.get(chain_identifier)
+            if chain is not None:
+                return chain.child_dict.get((" ", residue_number, " "))
+        return None
+
+    def apply_batch(self,
+                    structure: AnnotatedStructure,
+                    modifications: Iterable[Tuple[str, int, str]],
+                    inplace: bool = True) -> AnnotatedStructure:
+        """
+        Apply multiple residue modifications to a structure.
+
+        Equivalent to calling :meth:`modify` for every modification in turn, but the
+        residues of the structure are indexed only once (instead of being scanned for
+        every modification) and the modification log is extended in one go.
+
+        :param structure:
+            The structure to be modified.
+        :type structure: AnnotatedStructure
+
+        :param modifications:
+            Modifications as ``(chain_identifier, residue_number, target_abbreviation)`` tuples,
+            applied in the given order.
+        :type modifications: iterable of tuple[str, int, str]
+
+        :param inplace:
+            If ``True``, the structure is modified in place.
+            If ``False``, a copy of the structure is created and modified.
+        :type inplace: bool
+
+        :returns:
+            The modified structure. This is either the original structure
+            (if ``inplace=True``) or a modified copy.
+        :rtype: AnnotatedStructure
+
+        :raises ValueError:
+            If no residue matching a given chain identifier and residue number
+            can be found in the structure.
+        :raises KeyError:
+            If atom names required for a modification do not match those
+            in the structure or the template residue.
+        """
+
+        # if inplace is set to False, make a copy for the manipulation (Entity.copy() copies the
+        # structure tree without deepcopy's memo bookkeeping and also copies the modification log)
+        if not inplace:
+            structure = structure.copy()
+
+        # index all residues by (chain identifier, residue number); as in "modify()", the first match wins
+        # note: this assumes that chain IDs are unique over all models
+        residues = {}
+        for cur_residue in structure.get_residues():
+            full_id = cur_residue.get_full_id()
+            residues.setdefault((full_id[2], full_id[3][1]), cur_residue)
+
+        # log entries are collected and written at the end, also if a later modification fails
+        log_rows = []
+        try:
+            for chain_identifier, residue_number, target_abbreviation in modifications:
+                residue = residues.get((chain_identifier, residue_number))
+                if residue is None:
+                    raise_with_logging_error(f"Could not find specified residue in specified chain: {chain_identifier}:{residue_number}.",
+                                             logger=logger,
+                                             exception_type=ValueError)
+
+                original_residue_abbreviation = self._apply_to_residue(residue=residue,
+                                                                       target_abbreviation=target_abbreviation)
+                log_rows.append((residue_number, chain_identifier, original_residue_abbreviation, target_abbreviation))
+        finally:
+            if log_rows:
+                structure.add_modifications(log_rows)
+        return structure
+
+    def _apply_to_residue(self, residue: Residue, target_abbreviation: str) -> str:
+        """
+        Apply a modification to a single residue in place.
+
+        :param residue:
+            The residue to be modified.
+        :type residue: Bio.PDB.Residue.Residue
+
+        :param target_abbreviation:
+            Three-letter abbreviation of the target (modified) residue.
+        :type target_abbreviation: str
+
+        :returns:
+            Abbreviation of the residue before the modification.
+        :rtype: str
+        """
+
         # often hydrogens are modelled in and may cause problems depending on naming scheme,
         # so instead remove them; hydrogens for a modified version of a residue are added later
         self.remove_hydrogens(residue)
@@ -141,47 +258,31 @@ class Modifier(BaseModel):
         modification = self._library[original_residue_abbreviation, target_abbreviation]
         target_residue = self._library.load_residue_from_pdb(target_abbreviation)
 
-        # apply the application (changes to the respective residue are saved, since it is mutable) and log it
+        # apply the application (changes to the respective residue are saved, since it is mutable)
         self._execute_modification(residue=residue,
                                    modification=modification,
                                    template_residue=target_residue)
         residue.resname = target_residue.get_resname()
-
-        # attach information on applied application
-        structure.add_to_modification_log(residue_number=residue_number,
-                                          chain_identifier=chain_identifier,
-                                          original_abbreviation=original_residue_abbreviation,
-                                          target_abbreviation=target_abbreviation)
-        return structure
+        return original_residue_abbreviation
 
     @staticmethod
-    def _remove_from_residue_by_mapping(residue: Residue, atom_mapping: List[Tuple[Optional[str], Optional[str]]]):
+    def _remove_atoms(residue: Residue, atom_names: Iterable[str]):
         """
-        Remove atoms from a residue based on an atom name mapping.
+        Remove atoms from a residue by name.
 
-        This method interprets mapping entries where the target atom name
-        is ``None`` as an instruction to remove the corresponding original
-        atom from the residue. Atoms not present in the residue are ignored.
+        Atoms not present in the residue are ignored.
 
         :param residue:
             Residue from which atoms may be removed.
         :type residue: Bio.PDB.Residue.Residue
-        :param atom_mapping:
-            List of (original, target) atom name pairs. A ``None`` target
-            indicates that the original atom should be removed.
-        :type atom_mapping: list[tuple[str or None, str or None]]
+        :param atom_names:
+            Names of the atoms to remove (see :attr:`Modification.deletions`).
+        :type atom_names: iterable of str
         """
 
-        for ori, tar in atom_mapping:
-            if ori == tar:
-                continue
-
-            # skip atoms that are not present in the original residue (they were added in the previous step)
-            if ori is not None:
-                if tar is None:
-                    # this indicates, that this particular ori-atom is to be removed
-                    if ori in residue:
-                        residue.detach_child(ori)
+        for atom_name in atom_names:
+            if atom_name in residue:
+                residue.detach_child(atom_name)
 
     @staticmethod
     def _rename_atom(residue: Residue, old_name: str, new_name: str):
@@ -190,6 +291,7 @@ class Modifier(BaseModel):
 
         The atom is temporarily removed from the residue, its identifying
         properties are updated, and it is reinserted under the new name.
+        Identical names are a no-op.
 
         :param residue:
             Residue containing the atom to rename.
@@ -205,6 +307,10 @@ class Modifier(BaseModel):
             residue.
         """
 
+        # nothing to do (and no need to detach and re-add the atom)
+        if old_name == new_name:
+            return
+
         atom = residue[old_name]
 
         # Remove atom from residue internal list of atoms
@@ -248,18 +354,20 @@ class Modifier(BaseModel):
         """
 
         # remove atoms that map to "null"
-        Modifier._remove_from_residue_by_mapping(residue=residue,
-                                                 atom_mapping=modification.atom_mapping)
+        Modifier._remove_atoms(residue=residue,
+                               atom_names=modification.deletions)
 
         # since branches may rename atoms, multi-branch application could run into issues if the later branches
         # attempt to rename again; therefore, only execute renaming for the first one
         branch_first = True
+
+        # atoms names may change from the original to the modified residue; therefore, we use
+        # the atom mapping to get the anchor lists for both with the right atom
+        # identity (irrespective of name); for example, in VAL<>V3H the template residue's anchor atoms
+        # ['CB', 'CA', 'CG1', 'C', 'N'] map to ['CB', 'CA', 'CG2', 'C', 'N'] in the original residue
+        # (the inverse mapping is derived once per library modification)
+        _mapping = modification.inverse_mapping
         for branch in modification.add_branches:
-            # atoms names may change from the original to the modified residue; therefore, we use
-            # the atom mapping to get the anchor lists for both with the right atom
-            # identity (irrespective of name); for example, in VAL<>V3H the template residue's anchor atoms
-            # ['CB', 'CA', 'CG1', 'C', 'N'] map to ['CB', 'CA', 'CG2', 'C', 'N'] in the original residue
-            _mapping = {temp: ori for ori, temp in modification.atom_mapping}
             anchor_atoms_in_original_residue = [_mapping[x] for x in branch.anchor_atoms]
             logger.debug(f"Anchor atoms used for {residue.get_resname()}->{template_residue.get_resname()}: {anchor_atoms_in_original_residue} and {branch.anchor_atoms}")
 
@@ -285,7 +393,7 @@ class Modifier(BaseModel):
             # create roto-translational alignment
             M_rotation, v_translation = compute_alignment_transform(coord_reference=Modifier.atoms_to_array(original_anchor_atoms),
                                                                     coord_template=Modifier.atoms_to_array(template_anchor_atoms),
-                                                                    weights=np.array(branch.weights))
+                                                                    weights=branch.weights_array)
 
             # extract the atoms that are to be transferred from the template to the original residue
             add_atoms = [template_residue[atom_name] for atom_name in branch.add_atoms]
@@ -298,23 +406,17 @@ class Modifier(BaseModel):
 
             # rename and delete atoms based on atom_mapping (remove those that are mapped to "None" in the updated form)
             if branch_first:
-                for ori, tar in modification.atom_mapping:
-                    if ori == tar:
-                        continue
-
-                    # skip atoms that are not present in the original residue (they were added in the previous step)
-                    if ori is not None and tar is not None and ori != tar:
-                        # atom is to be renamed
-                        Modifier._rename_atom(residue, ori, tar)
-
-            # add new atoms
-            for atom_idx, atom in enumerate(add_atoms):
-                residue.add(Atom(name=atom.get_name(),
-                                 coord=coords_aligned[atom_idx],
+                for ori, tar in modification.renames:
+                    Modifier._rename_atom(residue, ori, tar)
+
+            # add new atoms (template attributes are read directly, the aligned coordinates are iterated row by row)
+            for atom, coord in zip(add_atoms, coords_aligned):
+                residue.add(Atom(name=atom.name,
+                                 coord=coord,
                                  bfactor=0,
                                  occupancy=1.0,
                                  altloc=' ',
-                                 fullname= f"{atom.get_fullname():>4}",
+                                 fullname=f"{atom.fullname:>4}",
                                  serial_number=None,
                                  element=atom.element))
             branch_first = False
@@ -333,7 +435,9 @@ class Modifier(BaseModel):
         :rtype: numpy.ndarray
         """
 
-        return np.array([atom.get_coord() for atom in atoms])
+        # reads the "coord" attribute directly (no accessor call per atom); for the few anchor atoms involved,
+        # converting the list in one call is faster than filling a preallocated array row by row
+        return np.array([atom.coord for atom in atoms])
 
     @staticmethod
     def remove_hydrogens(residue: Residue):
@@ -351,7 +455,8 @@ class Modifier(BaseModel):
 
         # deletes atom if it is a Hydrogen, because otherwise they could be "lingering" if they do not conform
         # to the standard naming scheme; note that Hydrogen deletions are not part of the ModificationLibrary
-        to_delete = [atom.name for atom in residue.get_atoms() if atom.name.startswith("H")]
+        # atoms are keyed by their name, so the names can be filtered without touching the atoms themselves
+        to_delete = [atom_name for atom_name in residue.child_dict if atom_name[:1] == "H"]
         for atom_name in to_delete:
             residue.detach_child(atom_name)
 
@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.spatial.transform import Rotation
 from typing import Tuple
 import logging
 
@@ -26,19 +25,26 @@ def compute_alignment_transform(coord_reference: np.ndarray, coord_template: np.
     :rtype: (3, ) ndarray
     """
 
-    # centroids (weighted)
-    cog_reference = np.average(coord_reference, axis=0, weights=weights)
-    cog_template = np.average(coord_template, axis=0, weights=weights)
+    # centroids (weighted); the weights are normalized once and shared by both centroids
+    weights = np.asarray(weights, dtype=np.float64)
+    weights_sum = weights.sum()
+    if weights_sum == 0:
+        raise ZeroDivisionError("Weights sum to zero, can't be normalized")
+    weights_normalized = weights / weights_sum
+    cog_reference = weights_normalized @ coord_reference
+    cog_template = weights_normalized @ coord_template
 
     # centered coordinates
     coord_centered_reference = coord_reference - cog_reference
     coord_centered_template = coord_template - cog_template
 
-    # optimal rotation (maps coord_centered_template onto coord_centered_reference)
-    rotation, _ = Rotation.align_vectors(coord_centered_reference,
-                                         coord_centered_template,
-                                         weights=weights)
-    M_rotation = rotation.as_matrix()
+    # optimal rotation (maps coord_centered_template onto coord_centered_reference), weighted Kabsch algorithm:
+    # SVD of the 3x3 weighted covariance matrix, with the sign of the last axis fixed to exclude reflections
+    covariance = (coord_centered_reference * weights[:, None]).T @ coord_centered_template
+    U, _, Vt = np.linalg.svd(covariance)
+    if np.linalg.det(U @ Vt) < 0:
+        U[:, -1] = -U[:, -1]
+    M_rotation = U @ Vt
 
     # since M_rotation * cog_template + V_translation = cog_reference
     v_translation = cog_reference - M_rotation @ cog_template
@@ -65,4 +71,9 @@ def apply_transform(coords: np.ndarray, M_rotation: np.ndarray, v_translation: n
     :return v_transformed: Returns the transformed coordinates: M_rotation @ coords + v_translation.
     :rtype: (M, 3) array
     """
-    return (M_rotation @ coords.T).T + v_translation
+
+    # row-vector form: no transposed copies of the coordinates, and the translation is added in place;
+    # the result keeps NumPy's type promotion (float32 coordinates with a float64 transform give float64)
+    coords_transformed = coords @ M_rotation.T
+    coords_transformed += v_translation
+    return coords_transformed
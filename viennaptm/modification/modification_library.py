@@ -4,10 +4,11 @@ import os
 from pathlib import Path
 from typing import List, Tuple, Union, Dict, Optional
 
+import numpy as np
 import pandas as pd
 from Bio.PDB import PDBParser
 from Bio.PDB.Residue import Residue
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 
 from viennaptm.utils.error_handling import raise_with_logging_error, raise_with_logging_warning
 from viennaptm.utils.fixtures import ViennaPTMFixtures
@@ -15,6 +16,9 @@ from viennaptm.utils.fixtures import ViennaPTMFixtures
 logger = logging.getLogger(__name__)
 fixtures = ViennaPTMFixtures()
 
+# parser for the bundled template residues, shared by all loads (the templates are known to be well-formed)
+_TEMPLATE_PARSER = PDBParser(QUIET=True)
+
 
 class AddBranch(BaseModel):
     """
@@ -54,7 +58,11 @@ class AddBranch(BaseModel):
     # atoms to be added (removal happens via the mapping in atom pairs)
     add_atoms: List[str] = Field(default_factory=list)
 
-    model_config = ConfigDict(extra="forbid")
+    # the weights as (read-only) array, created on validation instead of on every application
+    _weights_array: np.ndarray = PrivateAttr(default=None)
+
+    # assignments are validated, so that the weights array is rebuilt
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
 
     @model_validator(mode="after")
     def check_branch(self):
@@ -81,8 +89,20 @@ class AddBranch(BaseModel):
             self.weights = [1.0 for _ in range(len(self.anchor_atoms))]
             logger.warning(f"No weights provided for {len(self.anchor_atoms)} atoms, assuming they are equally important.")
 
+        self._weights_array = np.array(self.weights, dtype=np.float64)
+        self._weights_array.flags.writeable = False
         return self
 
+    @property
+    def weights_array(self) -> np.ndarray:
+        """
+        Weights of the anchor atoms as read-only array.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._weights_array
+
 
 class ModificationMetadata(BaseModel):
     """
@@ -132,23 +152,27 @@ class Modification(BaseModel):
                         Each entry is a tuple ``(original, modified)`` where
                         either element may be ``None`` to indicate deletion
                         or addition.
-    :vartype atom_mapping: list[tuple[str | None, str | None]]
+    :vartype atom_mapping: tuple[tuple[str | None, str | None], ...]
 
     :ivar add_branches: Branches defining how atoms are geometrically added.
     :vartype add_branches: list[AddBranch]
 
     Note:
         Atom deletions and renaming are handled exclusively via
-        ``atom_mapping``; branches only describe atom additions.
+        ``atom_mapping``; branches only describe atom additions. Both are
+        derived from ``atom_mapping`` during validation, which includes
+        assignments (see :attr:`deletions` and :attr:`renames`).
     """
 
     residue_original_abbreviation: str
     residue_modified_abbreviation: str
 
-    # contains a list of the form [('N', 'N'), ...] which maps the original residue's atom names
+    # contains pairs of the form (('N', 'N'), ...) which map the original residue's atom names
     # to the modified residue's; if an atom does not exist in one of the end-states, it is set to None
     # for example, atoms that need to be deleted during application, are marked as None
-    atom_mapping: List[Tuple[Union[str, None], Union[str, None]]] = Field(default_factory=list)
+    # (stored as an immutable tuple, since all derived atom operations below depend on it; reassigning
+    # the field is validated and derives them again)
+    atom_mapping: Tuple[Tuple[Union[str, None], Union[str, None]], ...] = Field(default_factory=tuple)
 
     # each AddBranch contains information on how to modify _one_ part (or branch) of the original
     # residue into the target, modified PTM; for most modifications, only one branch is needed, but
@@ -160,7 +184,61 @@ class Modification(BaseModel):
     # not mandatory
     metadata: ModificationMetadata = Field(default_factory=ModificationMetadata)
 
-    model_config = ConfigDict(extra="forbid")
+    # atom operations derived from "atom_mapping", so that they need not be filtered on every application
+    _deletions: Tuple[str, ...] = PrivateAttr(default=())
+    _renames: Tuple[Tuple[str, str], ...] = PrivateAttr(default=())
+    _inverse_mapping: Dict[Optional[str], Optional[str]] = PrivateAttr(default_factory=dict)
+
+    # assignments are validated, so that the derived atom operations are rebuilt
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+
+    @model_validator(mode="after")
+    def derive_atom_operations(self):
+        """
+        Derive the atom deletions, renamings and the inverse mapping from the atom mapping.
+
+        :return:
+            The validated modification.
+        :rtype: Modification
+        """
+
+        self._deletions = tuple(ori for ori, tar in self.atom_mapping if ori is not None and tar is None)
+        self._renames = tuple((ori, tar) for ori, tar in self.atom_mapping
+                              if ori is not None and tar is not None and ori != tar)
+        self._inverse_mapping = {tar: ori for ori, tar in self.atom_mapping}
+        return self
+
+    @property
+    def deletions(self) -> Tuple[str, ...]:
+        """
+        Names of original atoms that are removed (mapped to ``None``).
+
+        :rtype: tuple[str, ...]
+        """
+
+        return self._deletions
+
+    @property
+    def renames(self) -> Tuple[Tuple[str, str], ...]:
+        """
+        ``(original, modified)`` name pairs of atoms that are renamed, in mapping order.
+
+        :rtype: tuple[tuple[str, str], ...]
+        """
+
+        return self._renames
+
+    @property
+    def inverse_mapping(self) -> Dict[Optional[str], Optional[str]]:
+        """
+        Mapping of modified to original atom names (the inverse of :attr:`atom_mapping`).
+
+        The returned dictionary is shared and must not be modified.
+
+        :rtype: dict[str | None, str | None]
+        """
+
+        return self._inverse_mapping
 
 
 class ModificationLibraryMetadata(BaseModel):
@@ -182,7 +260,9 @@ class ModificationLibrary(BaseModel):
     It provides indexed access to modifications and utilities for loading
     template residues.
 
-    :ivar modifications: List of available residue modifications.
+    :ivar modifications: List of available residue modifications. Change it via item assignment,
+                         deletion or :meth:`append`, or assign a new list; in-place changes of the
+                         list itself are not reflected by lookups via residue pairs.
     :vartype modifications: list[Modification]
 
     :ivar metadata: Metadata of the library.
@@ -196,7 +276,14 @@ class ModificationLibrary(BaseModel):
     metadata: ModificationLibraryMetadata = Field(default_factory=ModificationLibraryMetadata)
     target_templates: Dict[str, str] = Field(default_factory=dict)
 
-    model_config = ConfigDict(extra="forbid")
+    # parsed template residues, keyed by (abbreviation, template path)
+    _template_cache: Dict[Tuple[str, str], Residue] = PrivateAttr(default_factory=dict)
+
+    # modifications keyed by (original abbreviation, modified abbreviation); the first entry wins for duplicates
+    # (rebuilt by every method changing "modifications" and on assignment of the list)
+    _modification_index: Dict[Tuple[str, str], Modification] = PrivateAttr(default_factory=dict)
+
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
 
     def __init__(self,
                  library_path: Union[str, Path] = None,
@@ -336,6 +423,21 @@ class ModificationLibrary(BaseModel):
                                                    metadata=modification_metadata,
                                                    **library["modifications"][key]))
             logger.debug(f"Modification {original}->{modified} added.")
+        self._index_modifications()
+
+    @model_validator(mode="after")
+    def _index_modifications(self):
+        """
+        Rebuild the lookup of modifications by ``(original, modified)`` abbreviations.
+
+        Also runs as validator, so that the lookup follows an assigned ``modifications`` list.
+        """
+
+        self._modification_index = {}
+        for mod in self.modifications:
+            self._modification_index.setdefault((mod.residue_original_abbreviation,
+                                                 mod.residue_modified_abbreviation), mod)
+        return self
 
     def _populate_minimized_PDBs(self, pdbs_minimized: Union[Path, str]):
         """
@@ -396,10 +498,9 @@ class ModificationLibrary(BaseModel):
         elif isinstance(index, tuple):
             # assume the first element is the original residue's abbreviation and the
             # second element the modified one's
-            original, modified = index
-            for mod in self.modifications:
-                if mod.residue_original_abbreviation == original and mod.residue_modified_abbreviation == modified:
-                    return mod
+            mod = self._modification_index.get(index)
+            if mod is not None:
+                return mod
         raise IndexError(f"Modification {index} not found in library, check residue identity and numbering.")
 
     def load_residue_from_pdb(self, target_abbreviation: str) -> Residue:
@@ -407,7 +508,8 @@ class ModificationLibrary(BaseModel):
         Load a template residue from a minimized PDB file.
 
         The PDB file must contain exactly one residue whose name matches
-        the requested target abbreviation.
+        the requested target abbreviation. Each template file is parsed only
+        once; callers receive an independent copy of the cached residue.
 
         :param target_abbreviation: Residue abbreviation to load.
         :type target_abbreviation: str
@@ -421,15 +523,20 @@ class ModificationLibrary(BaseModel):
 
         target_template_path = self.target_templates[target_abbreviation]
 
-        parser = PDBParser()
-        structure = parser.get_structure(id=target_abbreviation, file=target_template_path)
+        cache_key = (target_abbreviation, str(target_template_path))
+        residue = self._template_cache.get(cache_key)
+        if residue is None:
+            structure = _TEMPLATE_PARSER.get_structure(id=target_abbreviation, file=target_template_path)
 
-        # this assumes, that the template PDB files contain exactly one residue
-        residue = next(structure.get_residues())
-        if residue.resname not in target_abbreviation:
-            raise_with_logging_error(f"File {target_template_path} needs to contain exactly one residue entry for {target_abbreviation} with the residue name being part of the target name, abort.",
-                                     logger, ValueError)
-        return residue
+            # this assumes, that the template PDB files contain exactly one residue
+            residue = next(structure.get_residues())
+            if residue.resname not in target_abbreviation:
+                raise_with_logging_error(f"File {target_template_path} needs to contain exactly one residue entry for {target_abbreviation} with the residue name being part of the target name, abort.",
+                                         logger, ValueError)
+            self._template_cache[cache_key] = residue
+
+        # the cached residue must not be modified by callers
+        return residue.copy()
 
     def __setitem__(self, index, value):
         """
@@ -442,8 +549,31 @@ class ModificationLibrary(BaseModel):
         :type value: Modification
         """
 
-        logger.debug(f"Modification {self.modificationsp[index]} has value {value}.")
+        logger.debug(f"Modification {self.modifications[index]} has value {value}.")
         self.modifications[index] = value
+        self._index_modifications()
+
+    def __delitem__(self, index):
+        """
+        Remove the application at the specified index.
+
+        :param index: Index of the application to remove.
+        :type index: int
+        """
+
+        del self.modifications[index]
+        self._index_modifications()
+
+    def append(self, modification: Modification):
+        """
+        Add an application to the library.
+
+        :param modification: The application to add.
+        :type modification: Modification
+        """
+
+        self.modifications.append(modification)
+        self._index_modifications()
 
     def __len__(self):
         """
@@ -3,7 +3,6 @@ from typing import get_args, get_origin
 
 from pydantic import BaseModel
 
-from viennaptm.modification.modification_library import ModificationLibrary
 from viennaptm.utils.logger import get_package_version
 
 
@@ -184,6 +183,7 @@ def print_help_CLI(tool: str, argv: list[str], parameters_object):
 
 def print_list_ptms_CLI(destination: str):
     if destination is not None:
+        from viennaptm.modification.modification_library import ModificationLibrary
         library = ModificationLibrary()
         df_modifications = library._get_modification_metadata_df()
         if destination == "console":
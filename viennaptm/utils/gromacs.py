@@ -1,7 +1,10 @@
 import os
 import shutil
+import subprocess
+from functools import lru_cache
 
 
+@lru_cache(maxsize=1)
 def resolve_gmx_binary() -> str:
     """
     Determine the GROMACS executable to invoke.
@@ -12,7 +15,9 @@ def resolve_gmx_binary() -> str:
     2. The ``gmx`` executable discovered on the system ``PATH``.
 
     This function does not validate the GROMACS version; it only
-    ensures that an executable can be located.
+    ensures that an executable can be located. The result is cached for the
+    lifetime of the process (call ``resolve_gmx_binary.cache_clear()`` after
+    changing ``GMX_BIN`` or ``PATH``); failed lookups are not cached.
 
     :return:
         Path to the GROMACS executable or its command name.
@@ -35,3 +40,51 @@ def resolve_gmx_binary() -> str:
         "GROMACS binary not found. "
         "Set GMX_BIN or ensure `gmx` is within PATH."
     )
+
+
+
+@lru_cache(maxsize=4)
+def gmx_version(gmx: str) -> str:
+    """
+    Obtain the version information of a GROMACS binary (the output of ``gmx --version``).
+
+    The result is cached per binary for the lifetime of the process.
+
+    :param gmx:
+        Path to the GROMACS executable or its command name.
+    :type gmx: str
+
+    :return:
+        The version information, or an empty string if it could not be obtained.
+    :rtype: str
+    """
+
+    try:
+        result = subprocess.run([gmx, "--version"], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return result.stdout
+
+
+def gmx_uses_thread_mpi(gmx: str) -> bool:
+    """
+    Determine whether a GROMACS binary was built with the internal thread-MPI library.
+
+    Only thread-MPI builds accept ``mdrun -ntmpi``; builds against a real MPI library
+    reject it. The ``MPI library`` line of ``gmx --version`` is inspected (see :func:`gmx_version`).
+
+    :param gmx:
+        Path to the GROMACS executable or its command name.
+    :type gmx: str
+
+    :return:
+        ``True`` if the binary uses thread-MPI, ``False`` otherwise (including if the
+        version information could not be obtained).
+    :rtype: bool
+    """
+
+    for line in gmx_version(gmx).splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "MPI library":
+            return value.strip() == "thread_mpi"
+    return False
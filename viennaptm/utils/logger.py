@@ -1,7 +1,11 @@
+import atexit
+import queue
 import sys
 import logging
+import logging.handlers
 from importlib.metadata import version, PackageNotFoundError
 from pathlib import Path
+from typing import Optional
 from datetime import datetime
 
 from viennaptm.dataclasses.parameters.modifier_parameters import ModifierParameters
@@ -29,20 +33,27 @@ Logging format used in non-debug (INFO) mode.
 Provides concise log output suitable for CLI usage.
 """
 
-def setup_file_logging(log_file: Path, debug: bool = False) -> None:
+# background listener writing file log records (set up by "setup_logging()")
+_FILE_LOG_LISTENER: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging(log_file: Optional[Path] = None, debug: bool = False) -> None:
     """
-    Configure logging to write to both a file and stdout.
+    Configure logging to write to stdout and, optionally, to a file.
 
-    This function initializes the root logger using ``logging.basicConfig``.
-    Log messages are written to the specified file and simultaneously
-    echoed to the console.
+    This function initializes the root logger using a single ``logging.basicConfig``
+    call. Log messages are always written to the console; if a log file is given,
+    they are additionally written to that file (the file is only opened in this case).
+    File output is handed over to a background thread through a queue
+    (:class:`logging.handlers.QueueHandler` / :class:`logging.handlers.QueueListener`),
+    so that logging calls do not block on disk I/O. The listener is stopped (and all
+    pending records are written) at interpreter exit.
 
     When debug mode is enabled, the logging level is set to ``DEBUG`` and
     a verbose format including timestamps and logger names is used.
 
     :param log_file:
-        Path to the log file. The file is opened in append mode.
-    :type log_file: pathlib.Path
+        Path to the log file, opened in append mode. If ``None``, only console logging is set up.
+    :type log_file: pathlib.Path, optional
 
     :param debug:
         If ``True``, enable DEBUG-level logging with verbose formatting.
@@ -50,40 +61,34 @@ def setup_file_logging(log_file: Path, debug: bool = False) -> None:
     :type debug: bool
     """
 
-    logging.basicConfig(
-        level=logging.DEBUG if debug else logging.INFO,
-        format=DEBUG_FORMAT if debug else INFO_FORMAT,
-        datefmt=DEBUG_DATEFMT if debug else None,
-        handlers=[
-            logging.FileHandler(log_file, mode="a", encoding="utf-8"),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    global _FILE_LOG_LISTENER
 
+    # "basicConfig()" does not touch an already configured root logger, so neither open a log file
+    if logging.getLogger().handlers:
+        return
 
-def setup_console_logging(debug: bool = False) -> None:
-    """
-    Configure logging to write to stdout only.
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file is not None:
+        file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter(DEBUG_FORMAT if debug else INFO_FORMAT,
+                                                    datefmt=DEBUG_DATEFMT if debug else None))
 
-    This function initializes the root logger using ``logging.basicConfig``
-    with a single console handler.
+        # the queue handler merges the arguments into the message only, the file handler
+        # (running on the listener thread) applies the actual format
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(queue_handler)
 
-    When debug mode is enabled, DEBUG-level logging and verbose formatting
-    (including timestamps) are activated.
-
-    :param debug:
-        If ``True``, enable DEBUG-level logging with verbose formatting.
-        Otherwise, INFO-level logging with a concise format is used.
-    :type debug: bool
-    """
+        _FILE_LOG_LISTENER = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _FILE_LOG_LISTENER.start()
+        atexit.register(_FILE_LOG_LISTENER.stop)
 
     logging.basicConfig(
         level=logging.DEBUG if debug else logging.INFO,
         format=DEBUG_FORMAT if debug else INFO_FORMAT,
         datefmt=DEBUG_DATEFMT if debug else None,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=handlers
     )
 
 
@@ -125,9 +130,12 @@ def get_config_logger(include_file_handler: bool = False) -> logging.Logger:
     logger.addHandler(stream_handler)
 
     if include_file_handler:
-        root = logging.getLogger()
+        # the root logger's file handler sits behind the queue listener, if file logging is active
+        root_handlers = list(logging.getLogger().handlers)
+        if _FILE_LOG_LISTENER is not None:
+            root_handlers.extend(_FILE_LOG_LISTENER.handlers)
 
-        for handler in root.handlers:
+        for handler in root_handlers:
             if isinstance(handler, logging.FileHandler):
                 # Clone file handler safely
                 file_handler = logging.FileHandler(
@@ -188,11 +196,8 @@ def instantiate_logging_CLI(cfg: ModifierParameters, logger) -> None:
     :type logger: logging.Logger
     """
 
-    # initialize logging
-    if cfg.is_console_logging():
-        setup_console_logging(debug=cfg.debug)
-    else:
-        setup_file_logging(cfg.log_file_path(), debug=cfg.debug)
+    # initialize logging (the log file path is None for console logging)
+    setup_logging(log_file=cfg.log_file_path(), debug=cfg.debug)
 
     # log (localized) execution start
     logger.info("Starting execution: %s",datetime.now().strftime("%Y-%m-%d %H:%M:%S"))